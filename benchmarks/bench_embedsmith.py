@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for embedsmith.
+
+Times template rendering, plan rendering, project creation on tmpfs and on
+disk, CLI cold start and batch generation, and writes the results as JSON
+so runs can be compared across versions:
+
+    python benchmarks/bench_embedsmith.py --output bench.json
+    python benchmarks/bench_embedsmith.py --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import embedsmith  # noqa: E402
+from embedsmith import EmbeddedProjectCreator, ProjectConfig  # noqa: E402
+from embedsmith.batch import BatchJob, embedsmith_batch  # noqa: E402
+from embedsmith.core import PROJECT_FILES  # noqa: E402
+from embedsmith.events import SilentSink  # noqa: E402
+from embedsmith.templates import RenderMemo, TemplateBundle, TemplateCache, TemplateManager  # noqa: E402
+
+
+def measure(func, repeat: int, setup=None) -> dict:
+    """Call func repeat times and summarise the wall-clock durations"""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "repeat": repeat,
+    }
+
+
+def bench_render(repeat: int) -> dict:
+    manager = TemplateManager()
+    # Cold: private caches emptied before every sample and no bundle, so each
+    # render reads, parses and substitutes the loose .j2 file
+    cold = TemplateManager(cache=TemplateCache(), bundle=TemplateBundle({}), render_memo=RenderMemo())
+
+    def reset():
+        cold.cache.clear()
+        cold.render_memo.clear()
+
+    context = asdict(ProjectConfig())
+    results = {}
+    for template_name, _ in PROJECT_FILES:
+        results[f"render.cold.{template_name}"] = measure(
+            lambda: cold.render(template_name, context), repeat, setup=reset)
+        results[f"render.warm.{template_name}"] = measure(
+            lambda: manager.render(template_name, context), repeat)
+    return results
+
+
+def bench_plan(repeat: int, scratch: Path) -> dict:
+    creator = EmbeddedProjectCreator(str(scratch / "plan"))
+    return {"get_files_to_create": measure(creator.get_files_to_create, repeat)}
+
+
+def bench_create_project(repeat: int, scratch: Path, label: str) -> dict:
+    results = {}
+    for jobs in (1, 4):
+        target = scratch / f"project-{jobs}"
+
+        def create():
+            EmbeddedProjectCreator(str(target), jobs=jobs, events=SilentSink()).create_project(overwrite=True)
+
+        results[f"create_project.{label}.jobs{jobs}"] = measure(
+            create, repeat, setup=lambda: shutil.rmtree(target, ignore_errors=True))
+        # Second run over an identical tree only hashes and skips
+        results[f"create_project.{label}.jobs{jobs}.unchanged"] = measure(create, repeat)
+    return results
+
+
+def bench_cli_startup(repeat: int) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    results = {}
+    for name, args in (("help", ["--help"]), ("list_presets", ["--list-presets"])):
+        command = [sys.executable, "-m", "embedsmith.cli"] + args
+        results[f"cli.{name}"] = measure(
+            lambda: subprocess.run(command, env=env, stdout=subprocess.DEVNULL, check=True), repeat)
+    results["python.startup"] = measure(
+        lambda: subprocess.run([sys.executable, "-c", "pass"], check=True), repeat)
+    return results
+
+
+def bench_batch(projects: int, scratch: Path) -> dict:
+    target = scratch / "batch"
+    batch_jobs = [BatchJob(str(target / f"board-{i}"), {"mcu": f"cortex-m{i % 8}"})
+                  for i in range(projects)]
+
+    def run():
+        for result in embedsmith_batch(batch_jobs, overwrite=True):
+            assert result.success, result.error
+
+    stats = measure(run, 1, setup=lambda: shutil.rmtree(target, ignore_errors=True))
+    stats["projects"] = projects
+    stats["projects_per_second"] = projects / stats["min"]
+    return {"batch": stats}
+
+
+def run_benchmarks(repeat: int = 20, batch_projects: int = 100, disk_dir=None) -> dict:
+    """Run every benchmark and return the JSON-serialisable report"""
+    results = {}
+    results.update(bench_render(repeat))
+
+    tmpfs = Path("/dev/shm") if Path("/dev/shm").is_dir() else None
+    locations = [("disk", disk_dir or ROOT)]
+    if tmpfs:
+        locations.append(("tmpfs", tmpfs))
+
+    for label, parent in locations:
+        scratch = Path(tempfile.mkdtemp(prefix="embedsmith-bench-", dir=str(parent)))
+        try:
+            if label == "disk":
+                results.update(bench_plan(repeat, scratch))
+                results.update(bench_batch(batch_projects, scratch))
+            results.update(bench_create_project(repeat, scratch, label))
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    results.update(bench_cli_startup(max(3, repeat // 4)))
+
+    return {
+        "embedsmith_version": embedsmith.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.time(),
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """Return (name, baseline, current, ratio) for results slower than threshold"""
+    regressions = []
+    for name, stats in report["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old or not old.get("min"):
+            continue
+        ratio = stats["min"] / old["min"]
+        if ratio > threshold:
+            regressions.append((name, old["min"], stats["min"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark embedsmith")
+    parser.add_argument("--output", "-o", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--repeat", "-r", type=int, default=20, help="Repetitions per benchmark (default: 20)")
+    parser.add_argument("--batch-projects", type=int, default=100, help="Projects in the batch benchmark (default: 100)")
+    parser.add_argument("--disk-dir", help="Directory on a real disk for the disk benchmarks (default: repo root)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous JSON report")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio that counts as a regression (default: 1.25)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.repeat, args.batch_projects, args.disk_dir)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for name, old, new, ratio in regressions:
+            print(f"❌ {name}: {old * 1e3:.3f}ms -> {new * 1e3:.3f}ms ({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
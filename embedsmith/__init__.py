@@ -7,6 +7,44 @@ __version__ = "1.0.1"
 __author__ = "Clement Cole"
 __email__ = "clementacole75@gmail.com"
 
-from .core import embedsmith, ProjectConfig, EmbeddedProjectCreator
+# Public names are resolved on first access so that importing the package
+# (e.g. for the CLI's --help) does not pull in core, templates or archives.
+_EXPORTS = {
+    'embedsmith': 'core',
+    'ProjectConfig': 'core',
+    'EmbeddedProjectCreator': 'core',
+    'PlannedFile': 'core',
+    'embedsmith_batch': 'batch',
+    'load_manifest': 'batch',
+    'BatchJob': 'batch',
+    'BatchResult': 'batch',
+    'Event': 'events',
+    'HumanSink': 'events',
+    'JsonLinesSink': 'events',
+    'SilentSink': 'events',
+    'OutputBackend': 'outputs',
+    'FilesystemOutput': 'outputs',
+    'MemoryOutput': 'outputs',
+    'StagedOutput': 'outputs',
+    'TarOutput': 'outputs',
+    'ZipOutput': 'outputs',
+    'ContentStore': 'store',
+    'get_preset': 'presets',
+    'RenderService': 'server',
+}
 
-__all__ = ['embedsmith', 'ProjectConfig', 'EmbeddedProjectCreator']
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,215 @@
+"""
+Batch generation of many projects from a manifest.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator, List, Optional
+
+from .core import EmbeddedProjectCreator, ProjectConfig, TEMPLATE_FILES
+from .events import SilentSink
+from .outputs import FilesystemOutput
+from .store import ContentStore, StoreStats
+from .templates import TemplateManager, get_render_memo
+
+
+CONFIG_FIELDS = {f.name for f in fields(ProjectConfig)}
+
+
+@dataclass
+class BatchJob:
+    """One project to generate: output path plus ProjectConfig overrides"""
+    path: str
+    config: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of generating a single project"""
+    path: str
+    success: bool
+    duration: float
+    files: int = 0
+    error: Optional[str] = None
+    render_hits: int = 0
+    render_misses: int = 0
+    linked: int = 0
+    bytes_saved: int = 0
+
+
+@dataclass
+class BatchSummary:
+    """Totals for a finished batch"""
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    files: int = 0
+    elapsed: float = 0.0
+    render_hits: int = 0
+    render_misses: int = 0
+    linked: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def projects_per_second(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def render_hit_rate(self) -> float:
+        renders = self.render_hits + self.render_misses
+        return self.render_hits / renders if renders else 0.0
+
+    def add(self, result: BatchResult):
+        self.total += 1
+        self.files += result.files
+        self.render_hits += result.render_hits
+        self.render_misses += result.render_misses
+        self.linked += result.linked
+        self.bytes_saved += result.bytes_saved
+        if result.success:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+
+def _parse_entry(entry: Any, defaults: Dict[str, Any], where: str) -> BatchJob:
+    if not isinstance(entry, dict) or "path" not in entry:
+        raise ValueError(f"{where}: each project needs a 'path'")
+
+    overrides = entry.get("config", {k: v for k, v in entry.items() if k != "path"})
+    config = dict(defaults, **overrides)
+    unknown = set(config) - CONFIG_FIELDS
+    if unknown:
+        raise ValueError(f"{where}: unknown config field(s): {', '.join(sorted(unknown))}")
+    return BatchJob(str(entry["path"]), config)
+
+
+def load_manifest(manifest_path: str) -> List[BatchJob]:
+    """
+    Load a batch manifest.
+
+    JSON manifests are either a list of projects or an object with a
+    "projects" list and optional "defaults". JSONL manifests hold one
+    project per line. Each project has a "path" and either a "config"
+    object or ProjectConfig fields inline.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    if manifest_path.endswith(".jsonl"):
+        return [_parse_entry(json.loads(line), {}, f"{manifest_path}:{number}")
+                for number, line in enumerate(text.splitlines(), 1) if line.strip()]
+
+    data = json.loads(text)
+    defaults: Dict[str, Any] = {}
+    if isinstance(data, dict):
+        defaults = data.get("defaults", {})
+        data = data.get("projects", [])
+    return [_parse_entry(entry, defaults, f"{manifest_path}[{index}]")
+            for index, entry in enumerate(data)]
+
+
+def warm_templates():
+    """Load every planned template and index its placeholders"""
+    manager = TemplateManager()
+    for template_name, _ in TEMPLATE_FILES:
+        manager.template_fields(template_name)
+
+
+def build_project(job: BatchJob, overwrite: bool = False, jobs: int = 1,
+                  store: Optional[str] = None, store_link: str = "auto") -> BatchResult:
+    """Generate a single project quietly and report the outcome"""
+    start = time.perf_counter()
+
+    if os.path.exists(job.path) and not overwrite:
+        return BatchResult(job.path, False, time.perf_counter() - start,
+                           error="directory already exists (use overwrite)")
+
+    # Renders of templates that ignore the fields this job changes are
+    # served from the memo; report this job's share of hits and misses
+    before = get_render_memo().info()
+    content_store = ContentStore(store, store_link) if store else None
+    try:
+        creator = EmbeddedProjectCreator(job.path, ProjectConfig.from_preset(**job.config), jobs,
+                                         output=FilesystemOutput(content_store), events=SilentSink())
+        success = creator.create_project(overwrite=True)
+    except Exception as e:
+        return BatchResult(job.path, False, time.perf_counter() - start, error=str(e))
+    after = get_render_memo().info()
+
+    error = None
+    if not success:
+        error = "; ".join(f"{path}: {e}" for path, e in creator.errors) or "generation failed"
+    files = sum(1 for _ in creator.iter_files()) if success else 0
+    stats = content_store.stats if content_store is not None else StoreStats()
+    return BatchResult(job.path, success, time.perf_counter() - start, files=files, error=error,
+                       render_hits=after.hits - before.hits, render_misses=after.misses - before.misses,
+                       linked=stats.reflinked + stats.hardlinked, bytes_saved=stats.bytes_saved)
+
+
+def embedsmith_batch(batch_jobs: List[BatchJob], processes: Optional[int] = None,
+                     overwrite: bool = False, jobs: int = 1,
+                     store: Optional[str] = None, store_link: str = "auto") -> Iterator[BatchResult]:
+    """
+    Generate many projects, yielding each result as soon as it finishes.
+
+    Args:
+        batch_jobs: Projects to generate (see load_manifest)
+        processes: Worker processes (default: CPU count, 1 runs in-process)
+        overwrite: Whether to overwrite existing directories
+        jobs: Concurrent file writers per project
+        store: Content store directory shared by every project, so identical
+            files are linked instead of written once per project
+        store_link: How files are placed from the store (see ContentStore)
+
+    Yields:
+        BatchResult: One per project, in completion order
+    """
+    processes = processes or os.cpu_count() or 1
+
+    # Warm the cache before forking so workers inherit parsed templates
+    warm_templates()
+
+    if processes == 1 or len(batch_jobs) <= 1:
+        for job in batch_jobs:
+            yield build_project(job, overwrite, jobs, store, store_link)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=warm_templates) as executor:
+        futures = [executor.submit(build_project, job, overwrite, jobs, store, store_link) for job in batch_jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_batch(batch_jobs: List[BatchJob], processes: Optional[int] = None,
+              overwrite: bool = False, jobs: int = 1, quiet: bool = False,
+              store: Optional[str] = None, store_link: str = "auto") -> BatchSummary:
+    """Run a batch, printing per-project results and a throughput summary"""
+    summary = BatchSummary()
+    start = time.perf_counter()
+
+    for result in embedsmith_batch(batch_jobs, processes, overwrite, jobs, store, store_link):
+        summary.add(result)
+        if result.success:
+            if not quiet:
+                print(f"✅ {result.path} ({result.duration:.3f}s)")
+        else:
+            print(f"❌ {result.path}: {result.error}")
+
+    summary.elapsed = time.perf_counter() - start
+    if not quiet:
+        print(f"\n📊 {summary.succeeded}/{summary.total} projects in {summary.elapsed:.2f}s "
+              f"({summary.projects_per_second:.1f} projects/s, "
+              f"{summary.files_per_second:.0f} files/s), {summary.failed} failed")
+        print(f"🧠 Render cache: {summary.render_hits} hits, {summary.render_misses} misses "
+              f"({summary.render_hit_rate:.0%} hit rate)")
+        if store:
+            print(f"🔗 Store: {summary.linked} files linked, {summary.bytes_saved} bytes saved")
+    return summary
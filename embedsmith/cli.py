@@ -5,12 +5,177 @@ Command-line interface for embedsmith
 
 import argparse
 import sys
-import json
-from pathlib import Path
-from .core import embedsmith, ProjectConfig
 
+# Heavy modules (core, templates, outputs, events, json) are imported only
+# once a project is actually generated, so --help and --list-presets stay
+# fast. These mirror events.SINKS, outputs.ARCHIVE_FORMATS,
+# core.BUILD_PROFILES and store.LINK_MODES.
+PROGRESS_FORMATS = ["human", "json", "none"]
+ARCHIVE_FORMATS = ["tar.gz", "tar", "zip"]
+BUILD_PROFILES = ["debug", "release-speed", "release-size"]
+STORE_LINK_MODES = ["auto", "reflink", "hardlink", "copy"]
+STORE_LINK_HELP = ("How --store places files: auto/reflink (copy-on-write, falling back to a copy) "
+                   "or copy. 'hardlink' shares the store object's inode, so an in-place edit of "
+                   "one project file changes it in every project (default: auto)")
 
-def main():
+
+def make_sink(progress, stream=None, quiet=False):
+    """Build the progress sink selected on the command line"""
+    from .events import HumanSink, JsonLinesSink, SilentSink
+    
+    if progress == "json":
+        return JsonLinesSink(stream)
+    if progress == "none":
+        return SilentSink()
+    return HumanSink(stream, quiet=quiet)
+
+
+def batch_main(argv):
+    """Entry point for 'embedsmith batch MANIFEST'"""
+    from .batch import load_manifest, run_batch
+    
+    parser = argparse.ArgumentParser(
+        prog="embedsmith batch",
+        description="Craft many projects from a JSON or JSONL manifest"
+    )
+    parser.add_argument("manifest", help="Manifest file (.json or .jsonl)")
+    parser.add_argument(
+        "--processes", "-p",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Number of files to write concurrently per project (default: 1)"
+    )
+    parser.add_argument(
+        "--overwrite", "-f",
+        action="store_true",
+        help="Overwrite existing directories"
+    )
+    parser.add_argument(
+        "--quiet", "-q",
+        action="store_true",
+        help="Only report failures"
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DIR",
+        help="Content store directory; identical files are linked instead of written per project"
+    )
+    parser.add_argument(
+        "--store-link",
+        choices=STORE_LINK_MODES,
+        default="auto",
+        help=STORE_LINK_HELP
+    )
+    args = parser.parse_args(argv)
+    
+    try:
+        batch_jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error loading manifest: {e}")
+        sys.exit(1)
+    
+    summary = run_batch(batch_jobs, args.processes, args.overwrite, args.jobs, args.quiet, args.store,
+                        args.store_link)
+    sys.exit(0 if summary.failed == 0 else 1)
+
+
+def serve_main(argv):
+    """Entry point for 'embedsmith serve'"""
+    parser = argparse.ArgumentParser(
+        prog="embedsmith serve",
+        description="Serve project archives over HTTP on a Unix socket or localhost"
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Listen on a Unix domain socket instead of TCP"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="TCP address to bind (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="TCP port to bind (default: 8765)"
+    )
+    parser.add_argument(
+        "--template-dir",
+        help="Directory of .j2 templates overriding the packaged ones"
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=4,
+        help="Renders allowed at once; extra requests wait, then get 503 (default: 4)"
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=int,
+        default=64,
+        help="Size of the finished-archive cache in MiB (default: 64)"
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Log every request"
+    )
+    args = parser.parse_args(argv)
+    
+    from .server import serve
+    serve(args.socket, args.host, args.port, args.template_dir, args.max_concurrent,
+          args.cache_mb * 1024 * 1024, args.verbose)
+
+
+def dry_run(project_path, config, template_dir=None):
+    """Render the project in memory and list what would be written"""
+    from .core import EmbeddedProjectCreator
+    from .events import SilentSink
+    from .outputs import MemoryOutput
+    
+    output = MemoryOutput()
+    creator = EmbeddedProjectCreator(project_path, config, output=output, events=SilentSink(),
+                                     template_dir=template_dir)
+    success = creator.create_project(overwrite=True)
+    
+    for path, data in sorted(output.files.items()):
+        mode = "x" if path in output.executables else " "
+        print(f"{len(data):>8} {mode} {path}")
+    print(f"\n📋 {len(output.files)} files, {output.total_bytes} bytes (dry run, nothing written)")
+    return success
+
+
+def write_archive(project_path, config, target, archive_format=None, events=None, template_dir=None):
+    """Stream the project straight into an archive file or stdout"""
+    from pathlib import Path
+    from .core import EmbeddedProjectCreator
+    from .events import Event, MESSAGE
+    from .outputs import open_archive
+    
+    with open_archive(target, Path(project_path), archive_format) as output:
+        creator = EmbeddedProjectCreator(project_path, config, output=output, events=events,
+                                         template_dir=template_dir)
+        success = creator.create_project(overwrite=True)
+    creator.events(Event(MESSAGE, message=f"\n📦 {output.files} files, {output.total_bytes} bytes -> {target}"))
+    return success
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["batch"]:
+        return batch_main(argv[1:])
+    if argv[:1] == ["serve"]:
+        return serve_main(argv[1:])
+    
     parser = argparse.ArgumentParser(
         description="embedsmith - Craft professional embedded project layouts",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -20,6 +185,8 @@ def main():
                 embedsmith --mcu cortex-m7 --flash 1M         # Custom MCU configuration
                 embedsmith --config my_config.json            # Load from config file
                 embedsmith . --overwrite                      # Create in current directory
+                embedsmith batch boards.jsonl -p 8            # Craft every project in a manifest
+                embedsmith serve --socket /tmp/es.sock        # Serve archives to editors and portals
 
                 Quick Start:
                 1. embedsmith my-embedded-firmware
@@ -55,22 +222,19 @@ def main():
     parser.add_argument(
         "--compiler", "--toolchain",
         dest="compiler",
-        default="arm-none-eabi-gcc",
-        help="Compiler toolchain (default: arm-none-eabi-gcc)"
+        help="Compiler toolchain (default: from the MCU preset)"
     )
     
     parser.add_argument(
         "--flash", "--flash-size",
         dest="flash_size",
-        default="512K",
-        help="Flash memory size (default: 512K)"
+        help="Flash memory size (default: from the MCU preset)"
     )
     
     parser.add_argument(
         "--ram", "--ram-size",
         dest="ram_size",
-        default="128K",
-        help="RAM size (default: 128K)"
+        help="RAM size (default: from the MCU preset)"
     )
     
     parser.add_argument(
@@ -98,6 +262,32 @@ def main():
         help="Project description"
     )
     
+    parser.add_argument(
+        "--profile", "--build-profile",
+        dest="build_profile",
+        choices=BUILD_PROFILES,
+        default="debug",
+        help="Default build profile of the generated Makefile (default: debug)"
+    )
+    
+    parser.add_argument(
+        "--ram-code",
+        action="store_true",
+        help="Emit .ramfunc/TCM linker sections and startup copy loops for RAM-resident code"
+    )
+    
+    parser.add_argument(
+        "--driver-pack",
+        action="store_true",
+        help="Add ring-buffer based interrupt/DMA UART and SPI drivers with host stress tests"
+    )
+    
+    parser.add_argument(
+        "--binary-log",
+        action="store_true",
+        help="Add deferred-format binary logging (format strings kept out of flash, decoded on the host)"
+    )
+    
     parser.add_argument(
         "--config",
         type=str,
@@ -110,6 +300,74 @@ def main():
         help="Overwrite existing directory without prompting"
     )
     
+    parser.add_argument(
+        "--template-dir",
+        help="Directory of .j2 templates overriding the packaged ones"
+    )
+    
+    parser.add_argument(
+        "--overwrite-edited",
+        action="store_true",
+        help="Also overwrite generated files that were edited since the last run"
+    )
+    
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Number of files to write concurrently (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--store",
+        metavar="DIR",
+        help="Content store directory; identical files are linked to shared objects instead of copied"
+    )
+    
+    parser.add_argument(
+        "--store-link",
+        choices=STORE_LINK_MODES,
+        default="auto",
+        help=STORE_LINK_HELP
+    )
+    
+    parser.add_argument(
+        "--atomic",
+        action="store_true",
+        help="Build in a sibling staging directory and swap it in only when complete"
+    )
+    
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Remove previously generated files that are no longer part of the project"
+    )
+    
+    parser.add_argument(
+        "--dry-run", "-n",
+        action="store_true",
+        help="List the files that would be written and their sizes without touching the disk"
+    )
+    
+    parser.add_argument(
+        "--archive", "-o",
+        metavar="FILE",
+        help="Write the project into a .tar.gz/.tar/.zip archive instead of a directory ('-' for stdout)"
+    )
+    
+    parser.add_argument(
+        "--archive-format",
+        choices=ARCHIVE_FORMATS,
+        help="Archive format (default: from the --archive extension, tar.gz for stdout)"
+    )
+    
+    parser.add_argument(
+        "--progress",
+        choices=PROGRESS_FORMATS,
+        default="human",
+        help="Progress output: human-readable, JSON lines with timings, or none (default: human)"
+    )
+    
     parser.add_argument(
         "--quiet", "-q",
         action="store_true",
@@ -122,55 +380,93 @@ def main():
         help="List available MCU presets and exit"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # List presets and exit
     if args.list_presets:
+        from .presets import PRESETS
         print("Available MCU Presets:")
-        print("  cortex-m0      - ARM Cortex-M0 (entry-level)")
-        print("  cortex-m3      - ARM Cortex-M3 (mainstream)") 
-        print("  cortex-m4      - ARM Cortex-M4 (DSP capabilities)")
-        print("  cortex-m7      - ARM Cortex-M7 (high-performance)")
-        print("  cortex-m33     - ARM Cortex-M33 (security features)")
-        print("  riscv-rv32     - RISC-V RV32 (open architecture)")
+        for preset in PRESETS:
+            print(f"  {preset.name:<14} - {preset.description}")
+            print(f"  {'':<14}   flash {preset.flash_size} @ {preset.flash_origin}, "
+                  f"RAM {preset.ram_size} @ {preset.ram_origin}, FPU {preset.fpu or 'none'}"
+                  + "".join(f", {tcm.name} {tcm.size}" for tcm in preset.tcm))
         return
     
+    from .core import embedsmith, ProjectConfig, GENERATED_FILES_KEY
+    
     # Load configuration from file if provided
     config = None
     if args.config:
+        import json
         try:
             with open(args.config, 'r') as f:
                 config_data = json.load(f)
-            config = ProjectConfig(**config_data)
+            # embedsmith.json doubles as a config file; drop its file hashes
+            config_data.pop(GENERATED_FILES_KEY, None)
+            config = ProjectConfig.from_preset(**config_data)
             if not args.quiet:
                 print(f"📁 Loaded configuration from: {args.config}")
         except Exception as e:
             print(f"❌ Error loading config file: {e}")
             sys.exit(1)
     else:
-        # Create configuration from command line arguments
-        config = ProjectConfig(
-            project_name=args.project_name,
-            mcu=args.mcu,
-            compiler=args.compiler,
-            flash_size=args.flash_size,
-            ram_size=args.ram_size,
-            author=args.author,
-            version=args.version,
-            license=args.license,
-            description=args.description
-        )
+        # Create configuration from command line arguments; unset
+        # toolchain and memory options come from the MCU preset
+        try:
+            config = ProjectConfig.from_preset(
+                project_name=args.project_name,
+                mcu=args.mcu,
+                compiler=args.compiler,
+                flash_size=args.flash_size,
+                ram_size=args.ram_size,
+                author=args.author,
+                version=args.version,
+                license=args.license,
+                description=args.description,
+                build_profile=args.build_profile,
+                ram_code=args.ram_code,
+                driver_pack=args.driver_pack,
+                binary_log=args.binary_log
+            )
+        except ValueError as e:
+            print(f"❌ Invalid configuration: {e}", file=sys.stderr)
+            sys.exit(1)
+    
+    if args.dry_run:
+        sys.exit(0 if dry_run(args.project_path, config, args.template_dir) else 1)
+    
+    if args.archive:
+        try:
+            # Progress goes to stderr so an archive on stdout stays intact
+            events = make_sink(args.progress, sys.stderr, args.quiet)
+            success = write_archive(args.project_path, config, args.archive, args.archive_format, events,
+                                    args.template_dir)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error writing archive: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0 if success else 1)
     
     # Create project
     try:
         success = embedsmith(
             base_path=args.project_path,
             config=config,
-            overwrite=args.overwrite
+            overwrite=args.overwrite,
+            jobs=args.jobs,
+            overwrite_edited=args.overwrite_edited,
+            events=make_sink(args.progress, quiet=args.quiet),
+            template_dir=args.template_dir,
+            store=args.store,
+            store_link=args.store_link,
+            atomic=args.atomic,
+            prune=args.prune
         )
         
+        # Keep stdout machine-readable unless progress is for humans
+        verbose = not args.quiet and args.progress == "human"
         if success:
-            if not args.quiet:
+            if verbose:
                 print(f"\n🎉 Successfully crafted '{config.project_name}' at '{args.project_path}'")
                 print("🚀 Next steps:")
                 print(f"   cd {args.project_path}/firmware")
@@ -179,7 +475,7 @@ def main():
                 print("   code .                      # Open in VS Code")
             sys.exit(0)
         else:
-            if not args.quiet:
+            if verbose:
                 print("❌ Failed to craft project")
             sys.exit(1)
             
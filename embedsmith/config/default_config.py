@@ -2,6 +2,8 @@
 Default configuration for embedded projects.
 """
 
+from ..presets import preset_names
+
 DEFAULT_CONFIG = {
     "project_name": "firmware",
     "mcu": "cortex-m4",
@@ -13,22 +15,14 @@ DEFAULT_CONFIG = {
     "author": "Embedded Developer",
     "version": "1.0.0",
     
-    # Supported MCU architectures
-    "supported_mcus": [
-        "cortex-m0",
-        "cortex-m0+", 
-        "cortex-m3",
-        "cortex-m4",
-        "cortex-m7",
-        "cortex-m33",
-        "riscv32",
-        "avr"
-    ],
+    # Supported MCU architectures (see embedsmith.presets for their details)
+    "supported_mcus": preset_names(),
     
     # Supported compilers
     "supported_compilers": [
         "arm-none-eabi-gcc",
         "riscv32-unknown-elf-gcc",
+        "riscv-none-elf-gcc",
         "avr-gcc",
         "clang"
     ],
@@ -1,62 +1,304 @@
 import os
 import json
+import functools
+import hashlib
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, List, Callable, Iterable, Iterator, Tuple
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 from .templates import TemplateManager
+from .outputs import OutputBackend, FilesystemOutput, StagedOutput
+from .store import ContentStore
+from .presets import MemoryRegion, check_memory_map, get_preset, parse_size, template_values
+from .events import Event, EventSink, HumanSink, PHASE_START, PHASE_END, DIRECTORY, FILE, ERROR, MESSAGE
+
+
+# Build profiles understood by the generated Makefile (PROFILE=...)
+BUILD_PROFILES = ["debug", "release-speed", "release-size"]
+
+# Toolchain and memory map for MCUs without a preset
+GENERIC_DEFAULTS = {
+    "compiler": "arm-none-eabi-gcc",
+    "flash_start": "0x08000000",
+    "flash_size": "512K",
+    "ram_start": "0x20000000",
+    "ram_size": "128K",
+}
 
 
 @dataclass
 class ProjectConfig:
-    """Configuration for crafting embedded projects"""
+    """
+    Configuration for crafting embedded projects.
+
+    compiler and the flash/RAM fields left as None are filled from the MCU
+    preset (GENERIC_DEFAULTS for custom MCUs); given values override it.
+    """
     project_name: str = "firmware"
     mcu: str = "cortex-m4"
-    compiler: str = "arm-none-eabi-gcc"
-    flash_size: str = "512K"
-    ram_size: str = "128K"
-    flash_start: str = "0x08000000"
-    ram_start: str = "0x20000000"
+    compiler: Optional[str] = None
+    flash_size: Optional[str] = None
+    ram_size: Optional[str] = None
+    flash_start: Optional[str] = None
+    ram_start: Optional[str] = None
     author: str = "Embedded Developer"
     version: str = "1.0.0"
     license: str = "MIT"
     description: str = "Embedded firmware project"
+    build_profile: str = "debug"
+    ram_code: bool = False
+    driver_pack: bool = False
+    binary_log: bool = False
+
+    def __post_init__(self):
+        # The name becomes a directory and file name (archive root, build/<name>.elf)
+        if (not self.project_name or self.project_name in (".", "..")
+                or any(separator in self.project_name for separator in "/\\\0")):
+            raise ValueError(f"Invalid project name: {self.project_name!r} "
+                             "(must not be empty, '.', '..' or contain path separators)")
+        if self.build_profile not in BUILD_PROFILES:
+            raise ValueError(f"Unknown build profile: {self.build_profile} "
+                             f"(expected one of {', '.join(BUILD_PROFILES)})")
+
+        preset = get_preset(self.mcu)
+        if preset is not None:
+            self.mcu = preset.name
+            defaults = {"compiler": preset.compiler,
+                        "flash_start": preset.flash_origin, "flash_size": preset.flash_size,
+                        "ram_start": preset.ram_origin, "ram_size": preset.ram_size}
+        else:
+            defaults = GENERIC_DEFAULTS
+        for name, value in defaults.items():
+            if getattr(self, name) is None:
+                setattr(self, name, value)
+
+        # The linker script declares FLASH, RAM and the preset's TCM side by side
+        check_memory_map([MemoryRegion("FLASH", self.flash_start, self.flash_size),
+                          MemoryRegion("RAM", self.ram_start, self.ram_size)]
+                         + list(preset.tcm if preset else ()), f"MCU {self.mcu!r} memory map")
+
+    @classmethod
+    def from_preset(cls, mcu: str = "cortex-m4", **overrides) -> "ProjectConfig":
+        """
+        Build a config from optional settings (CLI arguments, JSON files).
+
+        Args:
+            mcu: Preset name or alias; unknown MCUs use GENERIC_DEFAULTS
+            **overrides: Other ProjectConfig fields; None values are ignored
+
+        Returns:
+            ProjectConfig: The resolved configuration
+        """
+        return cls(mcu=mcu or "cortex-m4", **{key: value for key, value in overrides.items() if value is not None})
+
+
+# (template, output path relative to the project root), in write order
+PROJECT_FILES = [
+    # Firmware files
+    ("makefile.j2", "firmware/Makefile"),
+    ("main_c.j2", "firmware/src/main.c"),
+    ("startup_c.j2", "firmware/src/startup.c"),
+    ("system_c.j2", "firmware/src/system.c"),
+    ("config_h.j2", "firmware/include/config.h"),
+    ("system_h.j2", "firmware/include/system.h"),
+    ("linker_script.j2", "firmware/linker_scripts/linker_script.ld"),
+    ("gpio_c.j2", "firmware/drivers/gpio.c"),
+
+    # Tool files
+    ("flash_tool.j2", "tools/scripts/flash_tool.py"),
+    ("fake_target.j2", "tools/scripts/fake_target.py"),
+    ("debug_tool.j2", "tools/scripts/debug_tool.py"),
+    ("debug_config.j2", "tools/configs/debug_config.json"),
+    ("memory_analyzer.j2", "tools/utilities/memory_analyzer.py"),
+
+    # Test files
+    ("test_main.j2", "tests/unit/test_main.py"),
+    ("test_hardware.j2", "tests/integration/test_hardware.py"),
+    ("host_build.j2", "tests/unit/host_build.py"),
+    ("test_host.j2", "tests/unit/test_host.py"),
+    ("hw_shim_h.j2", "tests/unit/shims/hw_shim.h"),
+    ("hw_shim_c.j2", "tests/unit/shims/hw_shim.c"),
+    ("unit_h.j2", "tests/unit/host/unit.h"),
+    ("test_system_c.j2", "tests/unit/host/test_system.c"),
+    ("test_gpio_c.j2", "tests/unit/host/test_gpio.c"),
+
+    # Documentation
+    ("readme.j2", "docs/README.md"),
+    ("api_docs.j2", "docs/api/index.md"),
+    ("hardware_spec.j2", "docs/hardware/specification.md"),
+
+    # Configuration and meta files
+    ("gitignore.j2", ".gitignore"),
+    ("license.j2", "LICENSE"),
+    ("project_guide.j2", "project_guide.md"),
+
+    # Scripts
+    ("build_sh.j2", "scripts/build.sh"),
+    ("deploy_sh.j2", "scripts/deploy.sh"),
+]
+
+# Optional interrupt/DMA driver pack (ProjectConfig.driver_pack)
+DRIVER_PACK_FILES = [
+    ("ring_buffer_h.j2", "firmware/drivers/ring_buffer.h"),
+    ("uart_h.j2", "firmware/drivers/uart.h"),
+    ("uart_c.j2", "firmware/drivers/uart.c"),
+    ("spi_h.j2", "firmware/drivers/spi.h"),
+    ("spi_c.j2", "firmware/drivers/spi.c"),
+    ("ring_buffer_stress_c.j2", "tests/unit/ring_buffer_stress.c"),
+    ("test_drivers_c.j2", "tests/unit/host/test_drivers.c"),
+    ("drivers_api.j2", "docs/api/drivers.md"),
+]
+
+# Optional deferred-format binary logging (ProjectConfig.binary_log)
+BINARY_LOG_FILES = [
+    ("binlog_h.j2", "firmware/include/binlog.h"),
+    ("binlog_c.j2", "firmware/src/binlog.c"),
+    ("test_binlog_c.j2", "tests/unit/host/test_binlog.c"),
+    ("test_binlog.j2", "tests/unit/test_binlog.py"),
+    ("binlog_api.j2", "docs/api/binlog.md"),
+]
+
+# Every template a project can use, whatever its options
+TEMPLATE_FILES = PROJECT_FILES + DRIVER_PACK_FILES + BINARY_LOG_FILES
+
+
+METADATA_FILE = "embedsmith.json"
+GENERATED_FILES_KEY = "generated_files"
+
+# Outcomes of emitting a planned file
+WRITTEN = "written"
+UNCHANGED = "unchanged"
+CONFLICT = "conflict"
+PRUNED = "pruned"
+
+
+def is_executable(filepath: Path) -> bool:
+    """Scripts are generated with the executable bit set"""
+    return filepath.suffix == '.py' or 'flash_tool' in filepath.name
+
+
+def content_hash(content: str) -> str:
+    """Hash recorded in embedsmith.json for a generated file"""
+    return "sha256:" + hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class GenerationReport:
+    """Files written, left untouched, or skipped because the user edited them"""
+    written: List[Path] = field(default_factory=list)
+    unchanged: List[Path] = field(default_factory=list)
+    conflicts: List[Path] = field(default_factory=list)
+    pruned: List[Path] = field(default_factory=list)
+
+    def add(self, path: Path, status: str):
+        {WRITTEN: self.written, UNCHANGED: self.unchanged, CONFLICT: self.conflicts,
+         PRUNED: self.pruned}[status].append(path)
+
+    def counts(self) -> Dict[str, int]:
+        return {WRITTEN: len(self.written), UNCHANGED: len(self.unchanged), CONFLICT: len(self.conflicts),
+                PRUNED: len(self.pruned)}
+
+    def summary(self) -> str:
+        summary = (f"{len(self.written)} written, {len(self.unchanged)} unchanged, "
+                   f"{len(self.conflicts)} modified locally")
+        if self.pruned:
+            summary += f", {len(self.pruned)} stale removed"
+        return summary
+
+
+@dataclass
+class PlannedFile:
+    """A file in the project plan whose content is rendered on demand"""
+    template: Optional[str]
+    path: Path
+    renderer: Callable[[], str] = field(repr=False, compare=False)
+
+    def render(self) -> str:
+        """Render the file content"""
+        return self.renderer()
+
+
+PROJECT_STRUCTURE = """
+🏗️  Project Structure:
+embedsmith-project/
+├── firmware/
+│   ├── src/                 # Source files
+│   ├── include/             # Header files
+│   ├── linker_scripts/      # Memory configuration
+│   ├── drivers/             # Hardware drivers
+│   └── build/               # Build artifacts
+├── tools/
+│   ├── scripts/             # Flash/debug scripts
+│   ├── configs/             # Tool configurations
+│   └── utilities/           # Analysis tools
+├── tests/
+│   ├── unit/                # Unit tests
+│   └── integration/         # Hardware tests
+├── docs/
+│   ├── api/                 # API documentation
+│   └── hardware/            # Hardware docs
+├── hardware/
+│   ├── schematics/          # Circuit diagrams
+│   ├── pcb/                 # PCB layouts
+│   └── 3d_models/           # Mechanical models
+├── scripts/                 # Build/deploy scripts
+├── config/                  # Project configuration
+├── utils/                   # Utility functions
+├── embedsmith.json          # Project metadata
+└── project_guide.md         # Development guide"""
 
 
 class EmbeddedProjectCreator:
     """Main class for crafting embedded project layouts"""
     
-    def __init__(self, base_path: str = ".", config: Optional[ProjectConfig] = None):
+    def __init__(self, base_path: str = ".", config: Optional[ProjectConfig] = None, jobs: int = 1,
+                 overwrite_edited: bool = False, output: Optional[OutputBackend] = None,
+                 events: Optional[EventSink] = None, template_dir: Optional[str] = None,
+                 prune: bool = False):
         self.base_path = Path(base_path)
         self.config = config or ProjectConfig()
-        self.template_manager = TemplateManager()
+        self.template_manager = TemplateManager(template_dir)
+        self.output = output or FilesystemOutput()
+        self.jobs = max(1, jobs)
+        self.overwrite_edited = overwrite_edited
+        self.prune = prune
+        self.errors: List[Tuple[Path, Exception]] = []
+        self.recorded_hashes: Dict[str, str] = {}
+        self.file_hashes: Dict[str, str] = {}
+        self.report = GenerationReport()
+        self.events: EventSink = events or HumanSink()
+        self.phase_timings: Dict[str, float] = {}
         
     def create_directory(self, path: Path) -> bool:
         """Create directory if it doesn't exist"""
         try:
-            path.mkdir(parents=True, exist_ok=True)
-            print(f"📁 Created: {path}")
+            self.output.make_dirs(path)
+            self.events(Event(DIRECTORY, phase="directories", path=path))
             return True
         except OSError as error:
-            print(f"❌ Error creating {path}: {error}")
+            self.events(Event(ERROR, phase="directories", path=path, message=str(error)))
             return False
     
+    def write_file(self, filepath: Path, content: str = "", make_parents: bool = True):
+        """Write a file with content, raising OSError on failure"""
+        if make_parents:
+            self.output.make_dirs(filepath.parent)
+        self.output.write_text(filepath, content, is_executable(filepath))
+    
     def create_file(self, filepath: Path, content: str = "") -> bool:
         """Create a file with content"""
+        start = time.perf_counter()
         try:
-            filepath.parent.mkdir(parents=True, exist_ok=True)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # Make scripts executable
-            if filepath.suffix == '.py' or 'flash_tool' in filepath.name:
-                filepath.chmod(0o755)
-                
-            print(f"📄 Created: {filepath}")
-            return True
+            self.write_file(filepath, content)
         except OSError as error:
-            print(f"❌ Error creating {filepath}: {error}")
+            self.events(Event(ERROR, path=filepath, message=str(error)))
             return False
+        self.events(Event(FILE, path=filepath, status=WRITTEN, size=len(content.encode('utf-8')),
+                          duration=time.perf_counter() - start))
+        return True
     
     def get_directory_structure(self) -> List[Path]:
         """Get the complete directory structure for embedded projects"""
@@ -90,149 +332,242 @@ class EmbeddedProjectCreator:
             self.base_path / "utils",
         ]
     
+    def template_context(self) -> Dict[str, Any]:
+        """The config fields plus values derived from them for the templates"""
+        context = asdict(self.config)
+        context["flash_bytes"] = parse_size(self.config.flash_size)
+        context["ram_bytes"] = parse_size(self.config.ram_size)
+        context["binary_log_enabled"] = 1 if self.config.binary_log else 0
+        # Binutils/GDB prefix, e.g. arm-none-eabi-gcc -> arm-none-eabi-
+        compiler = self.config.compiler
+        context["toolchain_prefix"] = compiler[:-len("gcc")] if compiler.endswith("gcc") else ""
+        context.update(template_values(self.config.mcu, self.config.ram_code))
+        return context
+    
+    def iter_files(self) -> Iterator[PlannedFile]:
+        """Lazily yield the files to create; nothing is rendered until asked"""
+        template_context = self.template_context()
+
+        files = (PROJECT_FILES + (DRIVER_PACK_FILES if self.config.driver_pack else [])
+                 + (BINARY_LOG_FILES if self.config.binary_log else []))
+        for template_name, relative_path in files:
+            yield PlannedFile(
+                template_name,
+                self.base_path / relative_path,
+                functools.partial(self.template_manager.render, template_name, template_context),
+            )
+
+        # Rendered last so it can record the hashes of everything above
+        yield PlannedFile(None, self.metadata_path, self.render_metadata)
+
+    @property
+    def metadata_path(self) -> Path:
+        return self.base_path / METADATA_FILE
+
+    def render_metadata(self) -> str:
+        """Render embedsmith.json: the config plus a hash per generated file"""
+        metadata = asdict(self.config)
+        metadata[GENERATED_FILES_KEY] = dict(sorted(self.file_hashes.items()))
+        return json.dumps(metadata, indent=2)
+
+    def load_recorded_hashes(self) -> Dict[str, str]:
+        """Return the file hashes recorded by the previous run, if any"""
+        try:
+            recorded = json.loads(self.output.read_text(self.metadata_path) or "{}").get(GENERATED_FILES_KEY, {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+        return recorded if isinstance(recorded, dict) else {}
+
     def get_files_to_create(self) -> List[tuple]:
         """Get list of files to create with their templates"""
-        template_context = asdict(self.config)
+        return [(planned.path, planned.render()) for planned in self.iter_files()]
+    
+    def emit_file(self, planned: PlannedFile, make_parents: bool = True) -> Tuple[str, str, int]:
+        """
+        Write a planned file unless it is unchanged or was edited by the user.
         
-        return [
-            # Firmware files
-            (self.base_path / "firmware" / "Makefile", 
-            self.template_manager.render("makefile.j2", template_context)),
-            
-            (self.base_path / "firmware" / "src" / "main.c", 
-            self.template_manager.render("main_c.j2", template_context)),
-            
-            (self.base_path / "firmware" / "src" / "system.c", 
-            self.template_manager.render("system_c.j2", template_context)),
-            
-            (self.base_path / "firmware" / "include" / "config.h", 
-            self.template_manager.render("config_h.j2", template_context)),
-            
-            (self.base_path / "firmware" / "include" / "system.h", 
-            self.template_manager.render("system_h.j2", template_context)),
-            
-            (self.base_path / "firmware" / "linker_scripts" / "linker_script.ld", 
-            self.template_manager.render("linker_script.j2", template_context)),
-            
-            (self.base_path / "firmware" / "drivers" / "gpio.c", 
-            self.template_manager.render("gpio_c.j2", template_context)),
-            
-            # Tool files
-            (self.base_path / "tools" / "scripts" / "flash_tool.py", 
-            self.template_manager.render("flash_tool.j2", template_context)),
-            
-            (self.base_path / "tools" / "scripts" / "debug_tool.py", 
-            self.template_manager.render("debug_tool.j2", template_context)),
-            
-            (self.base_path / "tools" / "configs" / "debug_config.json", 
-            self.template_manager.render("debug_config.j2", template_context)),
-            
-            (self.base_path / "tools" / "utilities" / "memory_analyzer.py", 
-            self.template_manager.render("memory_analyzer.j2", template_context)),
-            
-            # Test files
-            (self.base_path / "tests" / "unit" / "test_main.py", 
-            self.template_manager.render("test_main.j2", template_context)),
-            
-            (self.base_path / "tests" / "integration" / "test_hardware.py", 
-            self.template_manager.render("test_hardware.j2", template_context)),
-            
-            # Documentation
-            (self.base_path / "docs" / "README.md", 
-            self.template_manager.render("readme.j2", template_context)),
-            
-            (self.base_path / "docs" / "api" / "index.md", 
-            self.template_manager.render("api_docs.j2", template_context)),
-            
-            (self.base_path / "docs" / "hardware" / "specification.md", 
-            self.template_manager.render("hardware_spec.j2", template_context)),
-            
-            # Configuration and meta files
-            (self.base_path / ".gitignore", 
-            self.template_manager.render("gitignore.j2", template_context)),
-            
-            (self.base_path / "LICENSE", 
-            self.template_manager.render("license.j2", template_context)),
-            
-            (self.base_path / "embedsmith.json", 
-            json.dumps(template_context, indent=2)),
-            
-            (self.base_path / "project_guide.md", 
-            self.template_manager.render("project_guide.j2", template_context)),
-            
-            # Scripts
-            (self.base_path / "scripts" / "build.sh", 
-            self.template_manager.render("build_sh.j2", template_context)),
-            
-            (self.base_path / "scripts" / "deploy.sh", 
-            self.template_manager.render("deploy_sh.j2", template_context)),
-        ]
+        Returns:
+            tuple: (status, hash to record, size in bytes), status being one
+            of WRITTEN, UNCHANGED or CONFLICT
+        """
+        content = planned.render()
+        digest = content_hash(content)
+        size = len(content.encode('utf-8'))
+        key = planned.path.relative_to(self.base_path).as_posix()
+        recorded = self.recorded_hashes.get(key)
+        
+        try:
+            existing = self.output.read_text(planned.path)
+            current = None if existing is None else content_hash(existing)
+        except (OSError, ValueError):
+            current = ""
+        
+        if current == digest:
+            return UNCHANGED, digest, size
+        if current is not None and recorded is not None and current != recorded \
+                and not self.overwrite_edited:
+            return CONFLICT, recorded, size
+        
+        self.write_file(planned.path, content, make_parents)
+        return WRITTEN, digest, size
+    
+    def timed_emit(self, planned: PlannedFile, make_parents: bool = True):
+        """emit_file() plus its duration; failures are returned, not raised"""
+        start = time.perf_counter()
+        try:
+            result = self.emit_file(planned, make_parents)
+        except OSError as error:
+            return error, time.perf_counter() - start
+        return result, time.perf_counter() - start
+    
+    def record_result(self, planned: PlannedFile, result, duration: float) -> bool:
+        """Track an emitted file in the report, the hash manifest and the event stream"""
+        if isinstance(result, Exception):
+            self.errors.append((planned.path, result))
+            self.events(Event(ERROR, phase="files", path=planned.path, message=str(result), duration=duration))
+            return False
+        
+        status, digest, size = result
+        if planned.template is not None:
+            self.file_hashes[planned.path.relative_to(self.base_path).as_posix()] = digest
+        self.report.add(planned.path, status)
+        self.events(Event(FILE, phase="files", path=planned.path, status=status, size=size, duration=duration))
+        return True
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Emit start/end events around a phase and record its duration"""
+        self.events(Event(PHASE_START, phase=name))
+        data: Dict[str, Any] = {}
+        start = time.perf_counter()
+        try:
+            yield data
+        finally:
+            self.phase_timings[name] = time.perf_counter() - start
+            self.events(Event(PHASE_END, phase=name, duration=self.phase_timings[name], data=data))
     
     def create_project(self, overwrite: bool = False) -> bool:
         """Craft the complete embedded project"""
         
-        if self.base_path.exists() and self.base_path.is_dir():
+        if self.output.is_dir(self.base_path):
             if not overwrite:
                 response = input(f"🔄 The directory '{self.base_path}' already exists. Overwrite? (y/N): ")
                 if response.lower() != 'y':
-                    print("❌ Operation cancelled.")
+                    self.events(Event(ERROR, message="Operation cancelled."))
                     return False
             else:
-                print(f"🔄 Overwriting existing directory: {self.base_path}")
+                self.events(Event(MESSAGE, message=f"🔄 Overwriting existing directory: {self.base_path}"))
         
-        print(f"🚀 Crafting embedded project at: {self.base_path}/")
-        print(f"📋 Project: {self.config.project_name}")
-        print(f"🔧 MCU: {self.config.mcu}")
-        print(f"⚡ Flash: {self.config.flash_size}, RAM: {self.config.ram_size}")
+        self.events(Event(MESSAGE, message=(
+            f"🚀 Crafting embedded project at: {self.base_path}/\n"
+            f"📋 Project: {self.config.project_name}\n"
+            f"🔧 MCU: {self.config.mcu}\n"
+            f"⚡ Flash: {self.config.flash_size}, RAM: {self.config.ram_size}")))
         
+        self.phase_timings = {}
+        with self.phase("project") as summary:
+            success = self._create_project()
+            summary["success"] = success
+            summary["phases"] = dict(self.phase_timings)
+        return success
+    
+    def _create_project(self) -> bool:
         # Create directories
-        print("\n📁 Creating project structure...")
-        directories = self.get_directory_structure()
-        for directory in directories:
-            if not self.create_directory(directory):
-                return False
+        with self.phase("directories"):
+            directories = self.get_directory_structure()
+            for directory in directories:
+                if not self.create_directory(directory):
+                    return False
         
         # Create files
-        print("\n📄 Generating project files...")
-        files = self.get_files_to_create()
-        for filepath, content in files:
-            if not self.create_file(filepath, content):
+        with self.phase("files") as summary:
+            self.recorded_hashes = self.load_recorded_hashes()
+            self.file_hashes = {}
+            self.report = GenerationReport()
+            self.errors = []
+            
+            if self.prune:
+                self.prune_stale({planned.path for planned in self.iter_files()})
+            
+            if self.jobs > 1 and self.output.concurrent:
+                success = self.emit_files_parallel(self.iter_files(), directories)
+            else:
+                success = self.emit_files(self.iter_files())
+            
+            summary.update(self.report.counts())
+            summary["summary"] = self.report.summary()
+        return success
+    
+    def prune_stale(self, planned_paths: Iterable[Path]):
+        """Remove files recorded in embedsmith.json that are no longer generated"""
+        planned_paths = set(planned_paths)
+        for key, recorded in sorted(self.recorded_hashes.items()):
+            path = self.base_path / key
+            # Never follow a tampered manifest outside the project
+            if path in planned_paths or Path(key).is_absolute() or ".." in Path(key).parts:
+                continue
+            try:
+                existing = self.output.read_text(path)
+            except (OSError, ValueError):
+                continue
+            if existing is None:
+                continue
+            
+            if content_hash(existing) != recorded and not self.overwrite_edited:
+                # Keep the user's edits and keep tracking the file
+                self.file_hashes[key] = recorded
+                self.report.add(path, CONFLICT)
+                self.events(Event(FILE, phase="files", path=path, status=CONFLICT))
+                continue
+            try:
+                self.output.remove(path)
+            except OSError as error:
+                self.events(Event(ERROR, phase="files", path=path, message=str(error)))
+                continue
+            self.report.add(path, PRUNED)
+            self.events(Event(FILE, phase="files", path=path, status=PRUNED))
+    
+    def emit_files(self, plan: Iterable[PlannedFile]) -> bool:
+        """Render and write files one at a time, stopping at the first failure"""
+        for planned in plan:
+            if not self.record_result(planned, *self.timed_emit(planned)):
                 return False
-        
         return True
     
+    def emit_files_parallel(self, plan: Iterable[PlannedFile], created_dirs: Iterable[Path] = ()) -> bool:
+        """Render and write files on a bounded thread pool, collecting every failure"""
+        plan = list(plan)
+        files = [planned for planned in plan if planned.template is not None]
+        
+        # Create each missing parent once up front instead of once per file
+        for parent in sorted({planned.path.parent for planned in plan} - set(created_dirs)):
+            if not self.create_directory(parent):
+                return False
+        
+        # map() yields in plan order, so the report is deterministic
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            emitted = executor.map(functools.partial(self.timed_emit, make_parents=False), files)
+            for planned, (result, duration) in zip(files, emitted):
+                self.record_result(planned, result, duration)
+        
+        # Metadata goes last, once every hash is known
+        if not self.emit_files(planned for planned in plan if planned.template is None):
+            return False
+        
+        if self.errors:
+            self.events(Event(ERROR, phase="files",
+                              message=f"{len(self.errors)} of {len(plan)} files could not be created"))
+        return not self.errors
+    
     def print_structure(self):
         """Print the crafted project structure"""
-        print("\n🏗️  Project Structure:")
-        print("embedsmith-project/")
-        print("├── firmware/")
-        print("│   ├── src/                 # Source files")
-        print("│   ├── include/             # Header files")
-        print("│   ├── linker_scripts/      # Memory configuration")
-        print("│   ├── drivers/             # Hardware drivers")
-        print("│   └── build/               # Build artifacts")
-        print("├── tools/")
-        print("│   ├── scripts/             # Flash/debug scripts")
-        print("│   ├── configs/             # Tool configurations")
-        print("│   └── utilities/           # Analysis tools")
-        print("├── tests/")
-        print("│   ├── unit/                # Unit tests")
-        print("│   └── integration/         # Hardware tests")
-        print("├── docs/")
-        print("│   ├── api/                 # API documentation")
-        print("│   └── hardware/            # Hardware docs")
-        print("├── hardware/")
-        print("│   ├── schematics/          # Circuit diagrams")
-        print("│   ├── pcb/                 # PCB layouts")
-        print("│   └── 3d_models/           # Mechanical models")
-        print("├── scripts/                 # Build/deploy scripts")
-        print("├── config/                  # Project configuration")
-        print("├── utils/                   # Utility functions")
-        print("├── embedsmith.json          # Project metadata")
-        print("└── project_guide.md         # Development guide")
-
-
-def embedsmith(base_path: str = "embedded-project", config: Optional[ProjectConfig] = None, overwrite: bool = False) -> bool:
+        self.events(Event(MESSAGE, message=PROJECT_STRUCTURE))
+
+
+def embedsmith(base_path: str = "embedded-project", config: Optional[ProjectConfig] = None, overwrite: bool = False, jobs: int = 1,
+               overwrite_edited: bool = False, events: Optional[EventSink] = None,
+               template_dir: Optional[str] = None, store: Optional[str] = None,
+               atomic: bool = False, prune: bool = False, store_link: str = "auto") -> bool:
     """
     Convenience function to craft an embedded project.
     
@@ -240,14 +575,42 @@ def embedsmith(base_path: str = "embedded-project", config: Optional[ProjectConf
         base_path: Path where to create the project
         config: Project configuration
         overwrite: Whether to overwrite existing directory
+        jobs: Number of concurrent file writers (1 writes sequentially)
+        overwrite_edited: Whether to overwrite files edited since the last run
+        events: Progress event sink (default: human-readable output)
+        template_dir: Directory of .j2 files overriding the packaged templates
+        store: Cache directory of a content store; identical files are
+            linked to shared objects instead of written again
+        atomic: Stage the project in a sibling directory and swap it in only
+            once every file was written and synced
+        prune: Remove files recorded in embedsmith.json that are no longer generated
+        store_link: How files are placed from the store (see ContentStore)
     
     Returns:
         bool: True if successful, False otherwise
     """
-    crafter = EmbeddedProjectCreator(base_path, config)
-    success = crafter.create_project(overwrite)
+    content_store = ContentStore(store, store_link) if store else None
+    if atomic:
+        output: FilesystemOutput = StagedOutput(Path(base_path), content_store)
+    else:
+        output = FilesystemOutput(content_store)
+    
+    with output:
+        crafter = EmbeddedProjectCreator(base_path, config, jobs, overwrite_edited, output=output,
+                                         events=events, template_dir=template_dir, prune=prune)
+        success = crafter.create_project(overwrite)
+        if success and atomic:
+            try:
+                output.commit()
+            except OSError as error:
+                crafter.events(Event(ERROR, path=Path(base_path), message=str(error)))
+                success = False
+    
+    if content_store is not None:
+        crafter.events(Event(MESSAGE, message=f"🔗 Store: {content_store.stats.summary()}"))
     if success:
         crafter.print_structure()
-        print(f"\n✅ Successfully crafted project at: {base_path}/")
-        print("🎉 Happy coding! Start with 'firmware/src/main.c'")
-    return success
\ No newline at end of file
+        crafter.events(Event(MESSAGE, message=(
+            f"\n✅ Successfully crafted project at: {base_path}/\n"
+            "🎉 Happy coding! Start with 'firmware/src/main.c'")))
+    return success
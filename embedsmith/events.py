@@ -0,0 +1,128 @@
+"""
+Progress events emitted while crafting a project, and sinks that consume them.
+
+A sink is any callable taking an Event. EmbeddedProjectCreator reports
+through its sink instead of printing, so callers choose between human
+output, JSON lines or silence.
+"""
+
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TextIO
+
+
+# Event kinds
+PHASE_START = "phase_start"
+PHASE_END = "phase_end"
+DIRECTORY = "directory"
+FILE = "file"
+ERROR = "error"
+MESSAGE = "message"
+
+
+@dataclass
+class Event:
+    """A single progress event"""
+    kind: str
+    phase: Optional[str] = None
+    path: Optional[Path] = None
+    status: Optional[str] = None
+    size: int = 0
+    duration: float = 0.0
+    message: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+EventSink = Callable[[Event], None]
+
+
+class SilentSink:
+    """Discard every event"""
+
+    def __call__(self, event: Event):
+        pass
+
+
+class HumanSink:
+    """Print the familiar emoji progress lines; with quiet=True only errors"""
+
+    FILE_LINES = {
+        "written": "📄 Created: {path}",
+        "unchanged": "⏭️  Unchanged: {path}",
+        "conflict": "⚠️  Modified locally, not overwritten: {path}",
+        "pruned": "🗑️  Removed stale: {path}",
+    }
+    PHASE_LINES = {
+        "directories": "\n📁 Creating project structure...",
+        "files": "\n📄 Generating project files...",
+    }
+
+    def __init__(self, stream: Optional[TextIO] = None, quiet: bool = False):
+        self.stream = stream
+        self.quiet = quiet
+
+    def write(self, line: str):
+        print(line, file=self.stream or sys.stdout)
+
+    def __call__(self, event: Event):
+        if event.kind == ERROR:
+            if event.path is not None:
+                self.write(f"❌ Error creating {event.path}: {event.message}")
+            else:
+                self.write(f"❌ {event.message}")
+            return
+        if self.quiet:
+            return
+
+        if event.kind == MESSAGE:
+            self.write(event.message)
+        elif event.kind == DIRECTORY:
+            self.write(f"📁 Created: {event.path}")
+        elif event.kind == FILE:
+            self.write(self.FILE_LINES[event.status].format(path=event.path))
+        elif event.kind == PHASE_START and event.phase in self.PHASE_LINES:
+            self.write(self.PHASE_LINES[event.phase])
+        elif event.kind == PHASE_END and "summary" in event.data:
+            self.write(f"\n📊 {event.data['summary']}")
+
+
+class JsonLinesSink:
+    """Write one JSON object per event, with timestamps and phase durations"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        record: Dict[str, Any] = {"event": event.kind, "t": round(time.perf_counter() - self.start, 6)}
+        if event.phase is not None:
+            record["phase"] = event.phase
+        if event.path is not None:
+            record["path"] = str(event.path)
+        if event.status is not None:
+            record["status"] = event.status
+        if event.kind == FILE:
+            record["bytes"] = event.size
+        if event.kind in (FILE, PHASE_END):
+            record["duration"] = round(event.duration, 6)
+        if event.message is not None:
+            record["message"] = event.message
+        record.update(event.data)
+
+        line = json.dumps(record, default=str)
+        with self._lock:
+            stream = self.stream or sys.stdout
+            stream.write(line + "\n")
+            stream.flush()
+
+
+SINKS = {
+    "human": HumanSink,
+    "json": JsonLinesSink,
+    "none": SilentSink,
+}
@@ -0,0 +1,444 @@
+"""
+Output backends: where EmbeddedProjectCreator puts generated files.
+"""
+
+import errno
+import io
+import os
+import shutil
+import stat
+import sys
+import tarfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Set
+
+from .store import ContentStore
+
+
+class OutputBackend:
+    """Base class for destinations of generated project files"""
+
+    # Whether write_text may be called from several threads at once
+    concurrent = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Flush and release any underlying resources"""
+
+    def is_dir(self, path: Path) -> bool:
+        """Return True if path is an existing directory"""
+        raise NotImplementedError
+
+    def make_dirs(self, path: Path):
+        """Create a directory and its parents"""
+        raise NotImplementedError
+
+    def read_text(self, path: Path) -> Optional[str]:
+        """Return the current content of a file, or None if it does not exist"""
+        raise NotImplementedError
+
+    def write_text(self, path: Path, content: str, executable: bool = False):
+        """Write a file, replacing any previous content"""
+        raise NotImplementedError
+
+    def remove(self, path: Path):
+        """Delete a file; missing files are ignored"""
+        raise NotImplementedError
+
+
+class FilesystemOutput(OutputBackend):
+    """
+    Write files to the real filesystem.
+
+    With a ContentStore, identical files across projects are linked to a
+    shared object instead of being written again.
+    """
+
+    def __init__(self, store: Optional[ContentStore] = None):
+        self.store = store
+
+    def is_dir(self, path: Path) -> bool:
+        return path.is_dir()
+
+    def make_dirs(self, path: Path):
+        path.mkdir(parents=True, exist_ok=True)
+
+    def read_text(self, path: Path) -> Optional[str]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write_text(self, path: Path, content: str, executable: bool = False):
+        if self.store is not None:
+            self.store.materialize(path, content.encode('utf-8'), executable)
+            return
+        try:
+            # A file linked to a store object must be replaced, not rewritten
+            if os.stat(path).st_nlink > 1:
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        if executable:
+            path.chmod(0o755)
+
+    def remove(self, path: Path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+class MemoryOutput(OutputBackend):
+    """Collect files in memory as a path -> bytes mapping, without any disk I/O"""
+
+    def __init__(self):
+        self.files: Dict[Path, bytes] = {}
+        self.directories: Set[Path] = set()
+        self.executables: Set[Path] = set()
+        self._lock = threading.Lock()
+
+    def is_dir(self, path: Path) -> bool:
+        return path in self.directories
+
+    def make_dirs(self, path: Path):
+        with self._lock:
+            self.directories.add(path)
+            self.directories.update(path.parents)
+
+    def read_text(self, path: Path) -> Optional[str]:
+        data = self.files.get(path)
+        return None if data is None else data.decode('utf-8')
+
+    def write_text(self, path: Path, content: str, executable: bool = False):
+        data = content.encode('utf-8')
+        with self._lock:
+            if path.parent not in self.directories:
+                raise FileNotFoundError(f"No such directory: {path.parent}")
+            self.files[path] = data
+            if executable:
+                self.executables.add(path)
+            else:
+                self.executables.discard(path)
+
+    def remove(self, path: Path):
+        with self._lock:
+            self.files.pop(path, None)
+            self.executables.discard(path)
+
+    def as_dict(self, root: Path) -> Dict[str, bytes]:
+        """Return the files relative to root, keyed by POSIX path"""
+        return {path.relative_to(root).as_posix(): data
+                for path, data in sorted(self.files.items())}
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(len(data) for data in self.files.values())
+
+
+def _link_or_copy(src: str, dst: str):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _fsync_path(path: Path):
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:  # directories can't be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _libc_call(name: str, *args) -> bool:
+    """Call a Linux libc function; False if it is unavailable or unsupported"""
+    if not sys.platform.startswith("linux"):
+        return False
+    import ctypes
+    func = getattr(ctypes.CDLL(None, use_errno=True), name, None)
+    if func is None:
+        return False
+    if func(*args) == 0:
+        return True
+    error = ctypes.get_errno()
+    if error in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+        return False
+    raise OSError(error, os.strerror(error))
+
+
+def sync_tree(root: Path, files: Iterable[Path] = ()):
+    """Flush a freshly written tree to disk with as few sync calls as possible"""
+    fd = os.open(str(root), os.O_RDONLY) if os.path.isdir(root) else None
+    try:
+        # One syncfs() covers every file on the filesystem
+        if fd is not None and _libc_call("syncfs", fd):
+            return
+    finally:
+        if fd is not None:
+            os.close(fd)
+    files = list(files)
+    for path in files:
+        _fsync_path(path)
+    for directory in sorted({path.parent for path in files} | {Path(root)}):
+        _fsync_path(directory)
+
+
+def exchange_directories(staging: Path, root: Path) -> bool:
+    """
+    Atomically swap two directories with renameat2(RENAME_EXCHANGE).
+
+    Returns False when the platform or filesystem cannot do it.
+    """
+    AT_FDCWD, RENAME_EXCHANGE = -100, 2
+    return _libc_call("renameat2", AT_FDCWD, os.fsencode(str(staging)),
+                      AT_FDCWD, os.fsencode(str(root)), RENAME_EXCHANGE)
+
+
+class StagedOutput(FilesystemOutput):
+    """
+    Build the project in a sibling staging directory and swap it in on commit().
+
+    The staging directory starts as a hardlinked copy of the existing tree, so
+    unchanged and user-added files carry over for free; generated files are
+    replaced, never rewritten in place. commit() syncs the staged tree once and
+    swaps it for the live one, so a failed run leaves the old project intact.
+    Closing without commit() discards the staging directory.
+    """
+
+    def __init__(self, root: Path, store: Optional[ContentStore] = None):
+        super().__init__(store)
+        # Resolved so "." or "sub/.." still stage next to the target, not inside it;
+        # callers may keep passing paths under root as they spelled it
+        self.root = Path(root).resolve()
+        self.aliases = [self.root] + [alias for alias in (Path(root), Path(os.path.abspath(root)))
+                                      if alias != self.root]
+        self.staging = self.root.parent / f".{self.root.name}.staging-{os.getpid()}"
+        self.existed = self.root.is_dir()
+        self.written: List[Path] = []
+        self.committed = False
+        self._lock = threading.Lock()
+
+        shutil.rmtree(self.staging, ignore_errors=True)
+        if self.existed:
+            shutil.copytree(str(self.root), str(self.staging), symlinks=True, copy_function=_link_or_copy)
+        else:
+            self.staging.mkdir(parents=True)
+
+    def _relative(self, path: Path) -> Optional[Path]:
+        for root in self.aliases:
+            if path == root or root in path.parents:
+                return path.relative_to(root)
+        return None
+
+    def staged(self, path: Path) -> Path:
+        """Map a path under root to its location in the staging directory"""
+        relative = self._relative(path)
+        return path if relative is None else self.staging / relative
+
+    def is_dir(self, path: Path) -> bool:
+        if self._relative(path) == Path("."):
+            return self.existed
+        return super().is_dir(self.staged(path))
+
+    def make_dirs(self, path: Path):
+        super().make_dirs(self.staged(path))
+
+    def read_text(self, path: Path) -> Optional[str]:
+        return super().read_text(self.staged(path))
+
+    def write_text(self, path: Path, content: str, executable: bool = False):
+        # Files hardlinked from the live tree are replaced, not written through
+        staged = self.staged(path)
+        super().write_text(staged, content, executable)
+        with self._lock:
+            self.written.append(staged)
+
+    def remove(self, path: Path):
+        super().remove(self.staged(path))
+
+    def commit(self):
+        """Sync the staged tree and swap it in place of root"""
+        sync_tree(self.staging, self.written)
+        try:
+            cwd = Path(os.getcwd())
+        except OSError:
+            cwd = None
+
+        if not self.existed:
+            os.rename(self.staging, self.root)
+        elif exchange_directories(self.staging, self.root):
+            # staging now holds the previous tree
+            shutil.rmtree(self.staging, ignore_errors=True)
+        else:
+            backup = self.root.parent / f".{self.root.name}.old-{os.getpid()}"
+            os.rename(self.root, backup)
+            try:
+                os.rename(self.staging, self.root)
+            except OSError:
+                os.rename(backup, self.root)
+                raise
+            shutil.rmtree(backup, ignore_errors=True)
+
+        _fsync_path(self.root.parent)
+        self.committed = True
+        # The old tree is gone; follow the swap when running inside it ("embedsmith .")
+        if cwd is not None and (cwd == self.root or self.root in cwd.parents):
+            os.chdir(self.root)
+
+    def close(self):
+        if not self.committed:
+            shutil.rmtree(self.staging, ignore_errors=True)
+
+
+class ArchiveOutput(OutputBackend):
+    """Base class for streaming the project into a single archive"""
+
+    # Entries are appended in call order; keep it deterministic
+    concurrent = False
+
+    def __init__(self, fileobj: BinaryIO, root: Path, mtime: Optional[float] = None):
+        self.fileobj = fileobj
+        self.root = Path(root)
+        self.mtime = int(time.time() if mtime is None else mtime)
+        self.directories: Set[Path] = set()
+        self.files = 0
+        self.total_bytes = 0
+        self.owns_fileobj = False
+
+    def close(self):
+        if self.owns_fileobj:
+            self.fileobj.close()
+
+    def arcname(self, path: Path) -> str:
+        name = Path(self.root.name or "project") / path.relative_to(self.root)
+        # Never hand out entries that would extract outside the target directory
+        if name.is_absolute() or ".." in name.parts:
+            raise ValueError(f"archive entry would leave the project root: {name.as_posix()}")
+        return name.as_posix()
+
+    def is_dir(self, path: Path) -> bool:
+        return False
+
+    def read_text(self, path: Path) -> Optional[str]:
+        return None
+
+    def make_dirs(self, path: Path):
+        # Emit entries for every missing ancestor inside the root, outermost first
+        missing = [p for p in [path, *path.parents]
+                   if (p == self.root or self.root in p.parents) and p not in self.directories]
+        for directory in reversed(missing):
+            self.directories.add(directory)
+            self.add_directory(self.arcname(directory))
+
+    def write_text(self, path: Path, content: str, executable: bool = False):
+        if path.parent not in self.directories:
+            self.make_dirs(path.parent)
+        data = content.encode('utf-8')
+        self.add_file(self.arcname(path), data, 0o755 if executable else 0o644)
+        self.files += 1
+        self.total_bytes += len(data)
+
+    def add_directory(self, name: str):
+        raise NotImplementedError
+
+    def add_file(self, name: str, data: bytes, mode: int):
+        raise NotImplementedError
+
+
+class TarOutput(ArchiveOutput):
+    """Stream the project into a tar archive (gzip-compressed by default)"""
+
+    def __init__(self, fileobj: BinaryIO, root: Path, compression: str = "gz", mtime: Optional[float] = None):
+        super().__init__(fileobj, root, mtime)
+        # Stream mode ("w|gz") never seeks, so pipes and stdout work
+        self.tar = tarfile.open(fileobj=fileobj, mode=f"w|{compression}")
+
+    def add_directory(self, name: str):
+        info = tarfile.TarInfo(name)
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o755
+        info.mtime = self.mtime
+        self.tar.addfile(info)
+
+    def add_file(self, name: str, data: bytes, mode: int):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = mode
+        info.mtime = self.mtime
+        self.tar.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self.tar.close()
+        super().close()
+
+
+class ZipOutput(ArchiveOutput):
+    """Stream the project into a zip archive"""
+
+    def __init__(self, fileobj: BinaryIO, root: Path, mtime: Optional[float] = None):
+        super().__init__(fileobj, root, mtime)
+        self.zip = zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED)
+
+    def _info(self, name: str, mode: int) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, time.localtime(self.mtime)[:6])
+        info.external_attr = mode << 16
+        info.create_system = 3  # Unix, so the mode bits are honoured
+        return info
+
+    def add_directory(self, name: str):
+        info = self._info(name + "/", stat.S_IFDIR | 0o755)
+        info.external_attr |= 0x10  # MS-DOS directory flag
+        self.zip.writestr(info, b"")
+
+    def add_file(self, name: str, data: bytes, mode: int):
+        info = self._info(name, stat.S_IFREG | mode)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self.zip.writestr(info, data)
+
+    def close(self):
+        self.zip.close()
+        super().close()
+
+
+ARCHIVE_FORMATS = ["tar.gz", "tar", "zip"]
+
+
+def archive_format_for(target: str) -> str:
+    """Guess the archive format from a file name (stdout defaults to tar.gz)"""
+    if target.endswith(".zip"):
+        return "zip"
+    if target.endswith(".tar"):
+        return "tar"
+    return "tar.gz"
+
+
+def archive_output(fileobj: BinaryIO, root: Path, archive_format: str) -> ArchiveOutput:
+    """Create the archive backend for archive_format writing to fileobj"""
+    if archive_format == "zip":
+        return ZipOutput(fileobj, root)
+    return TarOutput(fileobj, root, "gz" if archive_format == "tar.gz" else "")
+
+
+def open_archive(target: str, root: Path, archive_format: Optional[str] = None) -> ArchiveOutput:
+    """Open an archive backend writing to target ("-" for stdout)"""
+    archive_format = archive_format or archive_format_for(target)
+    fileobj = sys.stdout.buffer if target == "-" else open(target, 'wb')
+
+    output = archive_output(fileobj, root, archive_format)
+    output.owns_fileobj = target != "-"
+    return output
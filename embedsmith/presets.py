@@ -0,0 +1,200 @@
+"""
+Registry of MCU presets: CPU and FPU flags, float ABI and memory map.
+
+The registry is plain data validated and indexed once at import. It only
+depends on the standard library's collections module, so --list-presets
+can use it without loading the generator.
+"""
+
+from collections import OrderedDict, namedtuple
+
+
+SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024 ** 2, "MB": 1024 ** 2}
+
+
+def parse_size(size) -> int:
+    """Convert a memory size such as '512K', '1M' or '0x8000' to bytes"""
+    text = str(size).strip().upper()
+    if text.startswith("0X"):
+        return int(text, 16)
+    number = text.rstrip("BKM")
+    unit = text[len(number):]
+    if not number.isdigit() or unit not in SIZE_UNITS:
+        raise ValueError(f"Invalid memory size: {size!r} (expected e.g. 512K, 1M or 0x8000)")
+    return int(number) * SIZE_UNITS[unit]
+
+
+MemoryRegion = namedtuple("MemoryRegion", ["name", "origin", "size"])
+
+McuPreset = namedtuple("McuPreset", [
+    "name",          # canonical name, also the -mcpu value for Arm cores
+    "description",
+    "arch",          # "arm" or "riscv"
+    "cpu_flags",     # ISA selection: -mcpu/-mthumb or -march/-mabi
+    "fpu",           # -mfpu value, or None without a hardware FPU
+    "float_abi",     # "soft", "softfp" or "hard"
+    "compiler",
+    "flash_origin",
+    "flash_size",
+    "ram_origin",
+    "ram_size",
+    "tcm",           # tightly-coupled memories: tuple of MemoryRegion
+    "aliases",
+])
+
+
+def _preset(name, description, arch, cpu_flags, compiler, flash, ram, fpu=None, float_abi="soft",
+            tcm=(), aliases=()):
+    return McuPreset(name, description, arch, cpu_flags, fpu, float_abi, compiler,
+                     flash[0], flash[1], ram[0], ram[1], tuple(MemoryRegion(*region) for region in tcm),
+                     tuple(aliases))
+
+
+ARM_GCC = "arm-none-eabi-gcc"
+
+PRESETS = [
+    _preset("cortex-m0", "ARM Cortex-M0 (entry-level)", "arm", "-mcpu=cortex-m0 -mthumb", ARM_GCC,
+            flash=("0x08000000", "64K"), ram=("0x20000000", "8K")),
+    _preset("cortex-m0plus", "ARM Cortex-M0+ (low-power)", "arm", "-mcpu=cortex-m0plus -mthumb", ARM_GCC,
+            flash=("0x08000000", "64K"), ram=("0x20000000", "16K"), aliases=["cortex-m0+"]),
+    _preset("cortex-m3", "ARM Cortex-M3 (mainstream)", "arm", "-mcpu=cortex-m3 -mthumb", ARM_GCC,
+            flash=("0x08000000", "256K"), ram=("0x20000000", "64K")),
+    _preset("cortex-m4", "ARM Cortex-M4F (DSP + single-precision FPU)", "arm", "-mcpu=cortex-m4 -mthumb",
+            ARM_GCC, flash=("0x08000000", "512K"), ram=("0x20000000", "128K"),
+            fpu="fpv4-sp-d16", float_abi="hard", aliases=["cortex-m4f"]),
+    _preset("cortex-m7", "ARM Cortex-M7 (high-performance, double-precision FPU, TCM)", "arm",
+            "-mcpu=cortex-m7 -mthumb", ARM_GCC,
+            flash=("0x08000000", "1M"), ram=("0x20020000", "384K"),
+            fpu="fpv5-d16", float_abi="hard",
+            tcm=[("ITCM", "0x00000000", "16K"), ("DTCM", "0x20000000", "128K")]),
+    _preset("cortex-m33", "ARM Cortex-M33 (TrustZone, single-precision FPU)", "arm", "-mcpu=cortex-m33 -mthumb",
+            ARM_GCC, flash=("0x08000000", "512K"), ram=("0x20000000", "256K"),
+            fpu="fpv5-sp-d16", float_abi="hard"),
+    _preset("riscv-rv32", "RISC-V RV32IMAC (open architecture)", "riscv",
+            "-march=rv32imac_zicsr -mabi=ilp32", "riscv-none-elf-gcc",
+            flash=("0x08000000", "128K"), ram=("0x20000000", "32K"), aliases=["riscv32"]),
+]
+
+FLOAT_ABIS = {"soft", "softfp", "hard"}
+
+# Output sections placed in each kind of tightly-coupled memory with --ram-code.
+# Each is (section, linker symbol stem, copied from flash at startup).
+TCM_SECTIONS = {
+    "ITCM": [(".itcm_text", "itcm", True)],
+    "DTCM": [(".dtcm_data", "dtcm_data", True), (".dtcm_bss", "dtcm_bss", False)],
+}
+
+
+def _validate(preset: McuPreset):
+    where = f"MCU preset {preset.name!r}"
+    if preset.arch not in ("arm", "riscv"):
+        raise ValueError(f"{where}: unknown arch {preset.arch!r}")
+    if preset.float_abi not in FLOAT_ABIS:
+        raise ValueError(f"{where}: unknown float ABI {preset.float_abi!r}")
+    if preset.float_abi != "soft" and not preset.fpu:
+        raise ValueError(f"{where}: float ABI {preset.float_abi!r} needs an FPU")
+    for region in preset.tcm:
+        if region.name not in TCM_SECTIONS:
+            raise ValueError(f"{where}: unknown tightly-coupled memory {region.name!r} "
+                             f"(expected one of {', '.join(TCM_SECTIONS)})")
+
+    check_memory_map([MemoryRegion("FLASH", preset.flash_origin, preset.flash_size),
+                      MemoryRegion("RAM", preset.ram_origin, preset.ram_size)] + list(preset.tcm), where)
+
+
+def check_memory_map(regions, where: str):
+    """Raise ValueError if any two memory regions overlap"""
+    spans = []
+    for region in regions:
+        try:
+            start = int(str(region.origin), 16)
+        except ValueError:
+            raise ValueError(f"{where}: invalid {region.name} origin {region.origin!r}") from None
+        spans.append((start, start + parse_size(region.size), region.name))
+    spans.sort()
+    for (_, end, name), (start, _, next_name) in zip(spans, spans[1:]):
+        if start < end:
+            raise ValueError(f"{where}: {name} overlaps {next_name}")
+
+
+def _build_index(presets):
+    index = OrderedDict()
+    for preset in presets:
+        _validate(preset)
+        for key in (preset.name,) + preset.aliases:
+            key = key.lower()
+            if key in index:
+                raise ValueError(f"Duplicate MCU preset name: {key!r}")
+            index[key] = preset
+    return index
+
+
+# name or alias (lower case) -> preset
+_INDEX = _build_index(PRESETS)
+
+
+def get_preset(name: str):
+    """Return the preset for an MCU name or alias, or None for a custom MCU"""
+    return _INDEX.get(str(name).strip().lower())
+
+
+def preset_names():
+    """Canonical preset names in registry order"""
+    return [preset.name for preset in PRESETS]
+
+
+def mcu_define(mcu: str) -> str:
+    """Preprocessor symbol for an MCU, e.g. cortex-m4 -> MCU_CORTEX_M4"""
+    return "MCU_" + "".join(c if c.isalnum() else "_" for c in str(mcu).upper())
+
+
+def _tcm_section(region: MemoryRegion, section: str, stem: str, copied: bool) -> str:
+    inputs = f"        *({section})\n        *({section}*)\n"
+    if copied:
+        # Linked at its TCM address, stored in flash after .data
+        return (f"    {section} :\n    {{\n        . = ALIGN(4);\n        _s{stem} = .;\n{inputs}"
+                f"        . = ALIGN(4);\n        _e{stem} = .;\n    }} >{region.name} AT> FLASH\n"
+                f"    _si{stem} = LOADADDR({section});\n")
+    return (f"    {section} (NOLOAD) :\n    {{\n        . = ALIGN(4);\n        _s{stem} = .;\n{inputs}"
+            f"        . = ALIGN(4);\n        _e{stem} = .;\n    }} >{region.name}\n")
+
+
+def template_values(mcu: str, ram_code: bool = False) -> dict:
+    """Values the templates need from the preset (generic Arm flags for custom MCUs)"""
+    preset = get_preset(mcu)
+    if preset is None:
+        cpu_flags, fpu, float_abi, tcm = f"-mcpu={mcu} -mthumb", None, "soft", ()
+    else:
+        cpu_flags, fpu, float_abi, tcm = preset.cpu_flags, preset.fpu, preset.float_abi, preset.tcm
+
+    if fpu:
+        cpu_flags += f" -mfpu={fpu} -mfloat-abi={float_abi}"
+    elif preset is None or preset.arch == "arm":
+        cpu_flags += " -mfloat-abi=soft"
+
+    tcm_memory = "\n".join(f"    {region.name} (rwx)  : ORIGIN = {region.origin}, LENGTH = {region.size}"
+                           for region in tcm)
+    tcm_defines = "\n".join(
+        f"#define HAS_{region.name} 1\n"
+        f"#define {region.name}_START {region.origin}\n"
+        f"#define {region.name}_SIZE {parse_size(region.size)}U"
+        for region in tcm) or "// No tightly-coupled memory on this MCU"
+
+    tcm_sections = ""
+    if ram_code and tcm:
+        tcm_sections = "\n" + "\n".join(
+            f"    /* {region.name}, initialised by the startup code */\n"
+            + "".join(_tcm_section(region, *section) for section in TCM_SECTIONS[region.name])
+            for region in tcm)
+
+    return {
+        "cpu_flags": cpu_flags,
+        "fpu": fpu or "none",
+        "float_abi": float_abi,
+        "has_fpu": 1 if fpu else 0,
+        "mcu_define": mcu_define(preset.name if preset else mcu),
+        "tcm_memory": tcm_memory,
+        "tcm_defines": tcm_defines,
+        "tcm_sections": tcm_sections,
+        "ram_code_enabled": 1 if ram_code else 0,
+    }
@@ -0,0 +1,390 @@
+"""
+Long-running render server.
+
+Keeps templates parsed and finished archives cached between requests, so
+tools that would otherwise spawn 'embedsmith' per request pay neither the
+interpreter start nor a disk round trip:
+
+    embedsmith serve --socket /tmp/embedsmith.sock
+    curl --unix-socket /tmp/embedsmith.sock -d '{"mcu": "cortex-m7"}' \
+        http://localhost/render -o project.tar.gz
+
+Endpoints:
+    POST /render[?format=tar.gz|tar|zip]  ProjectConfig JSON -> archive
+    GET  /stats                           cache and request counters as JSON
+    GET  /health                          "ok"
+"""
+
+import hashlib
+import io
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from string import Template
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .core import EmbeddedProjectCreator, ProjectConfig, TEMPLATE_FILES, GENERATED_FILES_KEY
+from .events import SilentSink
+from .outputs import ARCHIVE_FORMATS, archive_output
+from .templates import TemplateManager
+
+
+CONFIG_FIELDS = {f.name for f in fields(ProjectConfig)}
+
+CONTENT_TYPES = {
+    "tar.gz": "application/gzip",
+    "tar": "application/x-tar",
+    "zip": "application/zip",
+}
+
+# Largest request body accepted; a ProjectConfig is a few hundred bytes
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class RequestError(Exception):
+    """A request the server refuses, with the HTTP status to answer"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class ServerStats:
+    """Request and cache counters"""
+    requests: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    rejected: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    render_seconds: float = 0.0
+
+
+class ArchiveCache:
+    """LRU of finished archives bounded by their total size in bytes"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes) -> int:
+        """Insert an archive and return how many entries were evicted"""
+        if len(data) > self.max_bytes:
+            return 0
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= len(previous)
+        self._entries[key] = data
+        self.total_bytes += len(data)
+
+        evicted = 0
+        while self.total_bytes > self.max_bytes:
+            _, dropped = self._entries.popitem(last=False)
+            self.total_bytes -= len(dropped)
+            evicted += 1
+        return evicted
+
+
+class RenderService:
+    """
+    Render ProjectConfig requests into archives with warm templates and a response cache.
+
+    Args:
+        template_dir: Directory of .j2 files overriding the packaged templates
+        max_concurrent: Renders allowed at once; further requests wait
+        queue_timeout: Seconds a request may wait for a render slot before
+            it is rejected
+        cache_bytes: Size bound of the archive cache
+    """
+
+    def __init__(self, template_dir: Optional[str] = None, max_concurrent: int = 4,
+                 queue_timeout: float = 5.0, cache_bytes: int = 64 * 1024 * 1024):
+        self.template_dir = template_dir
+        self.template_manager = TemplateManager(template_dir)
+        self.cache = ArchiveCache(cache_bytes)
+        self.stats = ServerStats()
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[Tuple[Template, ...], str] = {}
+        self.warm()
+
+    def warm(self):
+        """Parse every planned template up front"""
+        self.template_fingerprint()
+
+    def template_fingerprint(self) -> str:
+        """Hash of the planned templates' sources; changes when a template changes"""
+        # The template cache hands back the same objects until a file changes,
+        # so the digest is only recomputed after an edit
+        templates = tuple(self.template_manager.get_template(name) for name, _ in TEMPLATE_FILES)
+        fingerprint = self._fingerprints.get(templates)
+        if fingerprint is None:
+            digest = hashlib.sha256()
+            for (name, _), template in zip(TEMPLATE_FILES, templates):
+                digest.update(name.encode("utf-8") + b"\0" + template.template.encode("utf-8") + b"\0")
+            fingerprint = digest.hexdigest()
+            with self._lock:
+                self._fingerprints = {templates: fingerprint}
+        return fingerprint
+
+    @staticmethod
+    def parse_config(data: Any) -> ProjectConfig:
+        """Build a ProjectConfig from request JSON, rejecting unknown fields"""
+        if not isinstance(data, dict):
+            raise RequestError(400, "request body must be a JSON object")
+        data = dict(data)
+        # embedsmith.json doubles as a config; drop its file hashes
+        data.pop(GENERATED_FILES_KEY, None)
+        unknown = set(data) - CONFIG_FIELDS
+        if unknown:
+            raise RequestError(400, f"unknown config field(s): {', '.join(sorted(unknown))}")
+        try:
+            return ProjectConfig.from_preset(**data)
+        except (TypeError, ValueError) as e:
+            raise RequestError(400, str(e))
+
+    def cache_key(self, config: ProjectConfig, archive_format: str) -> str:
+        """Canonical hash of everything that determines the archive"""
+        canonical = json.dumps({"config": asdict(config), "format": archive_format,
+                                "templates": self.template_fingerprint()},
+                               sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def build_archive(self, config: ProjectConfig, archive_format: str) -> bytes:
+        buffer = io.BytesIO()
+        root = Path(config.project_name)
+        with archive_output(buffer, root, archive_format) as output:
+            creator = EmbeddedProjectCreator(str(root), config, output=output, events=SilentSink(),
+                                             template_dir=self.template_dir)
+            success = creator.create_project(overwrite=True)
+        if not success:
+            errors = "; ".join(f"{path}: {error}" for path, error in creator.errors)
+            raise RequestError(500, errors or "generation failed")
+        return buffer.getvalue()
+
+    def render(self, data: Any, archive_format: str = "tar.gz") -> Tuple[bytes, str, bool]:
+        """
+        Return the archive for a request.
+
+        Returns:
+            tuple: (archive bytes, cache key, True if served from the cache)
+        """
+        if archive_format not in ARCHIVE_FORMATS:
+            raise RequestError(400, f"unknown archive format: {archive_format}")
+        config = self.parse_config(data)
+        key = self.cache_key(config, archive_format)
+
+        with self._lock:
+            self.stats.requests += 1
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats.hits += 1
+                return cached, key, True
+
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.stats.rejected += 1
+            raise RequestError(503, "too many concurrent renders")
+        try:
+            with self._lock:
+                self.stats.misses += 1
+                self.stats.in_flight += 1
+            start = time.perf_counter()
+            try:
+                archive = self.build_archive(config, archive_format)
+            except Exception:
+                with self._lock:
+                    self.stats.errors += 1
+                raise
+            with self._lock:
+                self.stats.render_seconds += time.perf_counter() - start
+                self.stats.evictions += self.cache.put(key, archive)
+        finally:
+            with self._lock:
+                self.stats.in_flight -= 1
+            self._slots.release()
+        return archive, key, False
+
+    def stats_dict(self) -> Dict[str, Any]:
+        """Counters for the /stats endpoint"""
+        with self._lock:
+            stats = asdict(self.stats)
+            stats.update(cached_archives=len(self.cache), cache_bytes=self.cache.total_bytes,
+                         cache_max_bytes=self.cache.max_bytes, max_concurrent=self.max_concurrent)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["template_cache"] = self.template_manager.cache_info()._asdict()
+        stats["render_memo"] = self.template_manager.render_info()._asdict()
+        return stats
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a RenderService"""
+
+    server_version = "embedsmith"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> RenderService:
+        return self.server.service
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_body(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        self.send_body(status, json.dumps(data, indent=2).encode("utf-8") + b"\n", "application/json", headers)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/stats":
+            self.send_json(200, self.service.stats_dict())
+        elif path == "/health":
+            self.send_body(200, b"ok\n", "text/plain")
+        else:
+            self.send_json(404, {"error": f"no such endpoint: {path}"})
+
+    def content_length(self) -> int:
+        """Body size from Content-Length; a negative read would block until EOF"""
+        value = self.headers.get("Content-Length")
+        if value is None:
+            return 0
+        try:
+            length = int(value)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise RequestError(400, f"invalid Content-Length: {value!r}")
+        return length
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/render":
+            self.send_json(404, {"error": f"no such endpoint: {url.path}"})
+            return
+        archive_format = parse_qs(url.query).get("format", ["tar.gz"])[0]
+
+        body = None
+        try:
+            length = self.content_length()
+            if length > MAX_REQUEST_BYTES:
+                raise RequestError(413, "request body too large")
+            body = self.rfile.read(length) if length else b"{}"
+            try:
+                data = json.loads(body.decode("utf-8"))
+            except ValueError as e:
+                raise RequestError(400, f"invalid JSON: {e}")
+            archive, key, hit = self.service.render(data, archive_format)
+        except RequestError as e:
+            headers = {"Retry-After": "1"} if e.status == 503 else {}
+            if body is None:
+                # An unread body would be parsed as the next request
+                headers["Connection"] = "close"
+            self.send_json(e.status, {"error": str(e)}, headers)
+            return
+        except Exception as e:
+            self.send_json(500, {"error": str(e)})
+            return
+
+        self.send_body(200, archive, CONTENT_TYPES[archive_format], {
+            "ETag": f'"{key}"',
+            "X-Embedsmith-Cache": "hit" if hit else "miss",
+        })
+
+
+class RenderHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server on a TCP address"""
+
+    daemon_threads = True
+
+    def __init__(self, address, service: RenderService, verbose: bool = False):
+        self.service = service
+        self.verbose = verbose
+        super().__init__(address, RenderRequestHandler)
+
+
+class RenderUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server on a Unix domain socket"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, service: RenderService, verbose: bool = False):
+        self.service = service
+        self.verbose = verbose
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, RenderRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def make_server(service: RenderService, socket_path: Optional[str] = None,
+                host: str = "127.0.0.1", port: int = 8765, verbose: bool = False):
+    """Bind a render server on a Unix socket if given, otherwise on host:port"""
+    if socket_path:
+        return RenderUnixServer(socket_path, service, verbose)
+    return RenderHTTPServer((host, port), service, verbose)
+
+
+def serve(socket_path: Optional[str] = None, host: str = "127.0.0.1", port: int = 8765,
+          template_dir: Optional[str] = None, max_concurrent: int = 4, cache_bytes: int = 64 * 1024 * 1024,
+          verbose: bool = False):
+    """
+    Run a render server until interrupted.
+
+    Args:
+        socket_path: Unix socket to listen on (default: TCP on host:port)
+        host: TCP address to bind
+        port: TCP port to bind
+        template_dir: Directory of .j2 files overriding the packaged templates
+        max_concurrent: Renders allowed at once
+        cache_bytes: Size bound of the archive cache
+        verbose: Log every request to stderr
+    """
+    service = RenderService(template_dir, max_concurrent, cache_bytes=cache_bytes)
+    with make_server(service, socket_path, host, port, verbose) as server:
+        where = socket_path or "http://{}:{}".format(*server.server_address[:2])
+        print(f"🛰️  embedsmith render server listening on {where}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n🛑 Server stopped")
@@ -0,0 +1,183 @@
+"""
+Content-addressed object store for deduplicating generated files.
+
+Most files in a fleet of projects are byte-identical (LICENSE, .gitignore,
+tools, docs). With a store, FilesystemOutput keeps one object per distinct
+content and materialises project files as reflinks to it, falling back to a
+plain copy when the filesystem cannot reflink. A reflink shares extents
+copy-on-write, so each project file can still be edited independently.
+
+Hardlinks are opt-in (link="hardlink", --store-link hardlink) because a
+hardlinked file *is* the store object: anything that writes it in place
+(editors that save in place, shell appends, chmod) changes the object and every
+other project linked to it. Objects are kept read-only and embedsmith always
+replaces files rather than rewriting them, which guards against accidents
+but not against tools that force the write.
+"""
+
+import errno
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# ioctl(dest_fd, FICLONE, src_fd) shares the source's extents (Btrfs, XFS)
+FICLONE = 0x40049409
+
+REFLINK = "reflink"
+HARDLINK = "hardlink"
+COPY = "copy"
+LINK_MODES = {
+    "auto": [REFLINK, COPY],
+    REFLINK: [REFLINK, COPY],
+    HARDLINK: [HARDLINK, COPY],
+    COPY: [COPY],
+}
+
+# Errors meaning "this filesystem can't link here", not "the write failed"
+LINK_ERRORS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EINVAL, errno.ENOTTY,
+               errno.EOPNOTSUPP, errno.ENOSYS, errno.EACCES}
+
+
+@dataclass
+class StoreStats:
+    """What a store did for the files it materialised"""
+    files: int = 0
+    reflinked: int = 0
+    hardlinked: int = 0
+    copied: int = 0
+    objects_added: int = 0
+    bytes_written: int = 0
+    bytes_saved: int = 0
+
+    def summary(self) -> str:
+        return (f"{self.reflinked + self.hardlinked} of {self.files} files linked "
+                f"({self.reflinked} reflinks, {self.hardlinked} hardlinks), "
+                f"{self.bytes_saved} bytes saved")
+
+
+def _temp_name(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _remove(path: Path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class ContentStore:
+    """
+    Objects keyed by SHA-256 under root/objects/ab/cdef..., shared between projects.
+
+    Args:
+        root: Cache directory holding the objects
+        link: "auto" (reflink, then copy), "reflink", "copy", or "hardlink"
+            to share inodes with the objects (see the module docstring for
+            why that is opt-in)
+    """
+
+    def __init__(self, root, link: str = "auto"):
+        if link not in LINK_MODES:
+            raise ValueError(f"Unknown link mode: {link} (expected one of {', '.join(LINK_MODES)})")
+        self.root = Path(root)
+        self.methods: List[str] = list(LINK_MODES[link])
+        self.stats = StoreStats()
+        self._lock = threading.Lock()
+
+    def object_path(self, digest: str, executable: bool = False) -> Path:
+        # Hardlinks share the mode bits, so executables are separate objects
+        suffix = ".x" if executable else ""
+        return self.root / "objects" / digest[:2] / (digest[2:] + suffix)
+
+    def add(self, data: bytes, executable: bool = False) -> Path:
+        """Store data if it is not already present and return its object path"""
+        return self._add(data, executable)[0]
+
+    def _add(self, data: bytes, executable: bool) -> Tuple[Path, bool]:
+        obj = self.object_path(hashlib.sha256(data).hexdigest(), executable)
+        try:
+            # A size mismatch means a linked copy was edited in place; re-store it
+            if os.stat(obj).st_size == len(data):
+                return obj, False
+        except FileNotFoundError:
+            pass
+
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        temp = _temp_name(obj)
+        try:
+            with open(temp, 'wb') as f:
+                f.write(data)
+            os.chmod(temp, 0o555 if executable else 0o444)
+            # Concurrent writers of the same object race harmlessly here
+            os.replace(temp, obj)
+        except OSError:
+            _remove(temp)
+            raise
+        with self._lock:
+            self.stats.objects_added += 1
+            self.stats.bytes_written += len(data)
+        return obj, True
+
+    def materialize(self, path: Path, data: bytes, executable: bool = False):
+        """Place data at path as a link to its object, or a copy if linking fails"""
+        obj, added = self._add(data, executable)
+        temp = _temp_name(path)
+        _remove(temp)
+
+        method = None
+        for candidate in self.methods:
+            try:
+                self._place(candidate, obj, temp, data, executable)
+            except OSError as error:
+                _remove(temp)
+                if candidate == COPY or error.errno not in LINK_ERRORS:
+                    raise
+                continue
+            method = candidate
+            break
+
+        try:
+            # Replacing (rather than rewriting) never touches a shared inode
+            os.replace(temp, path)
+        except OSError:
+            _remove(temp)
+            raise
+
+        with self._lock:
+            self.stats.files += 1
+            if method in (REFLINK, HARDLINK):
+                if method == REFLINK:
+                    self.stats.reflinked += 1
+                else:
+                    self.stats.hardlinked += 1
+                # The first link to a new object shares the bytes just stored
+                if not added:
+                    self.stats.bytes_saved += len(data)
+            else:
+                self.stats.copied += 1
+                self.stats.bytes_written += len(data)
+
+    def _place(self, method: str, obj: Path, temp: Path, data: bytes, executable: bool):
+        if method == HARDLINK:
+            os.link(obj, temp)
+            return
+
+        if method == REFLINK:
+            if fcntl is None:
+                raise OSError(errno.ENOSYS, "reflinks are not supported on this platform")
+            with open(obj, 'rb') as src, open(temp, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        else:
+            with open(temp, 'wb') as f:
+                f.write(data)
+        os.chmod(temp, 0o755 if executable else 0o644)
@@ -1,28 +1,299 @@
 import os
+import threading
+import zlib
+from collections import OrderedDict, namedtuple
 from pathlib import Path
 from string import Template
+from typing import Dict, FrozenSet, List, Optional
+from importlib import resources
+
+from .pack import BUNDLE_NAME, decode_bundle
+
+PACKAGE_DIR = Path(__file__).parent
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+class TemplateCache:
+    """Process-wide cache of parsed templates, invalidated on mtime/size change"""
+
+    def __init__(self, maxsize: int = 128, check_mtime: bool = True):
+        self.maxsize = maxsize
+        self.check_mtime = check_mtime
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, template_path: Path) -> Template:
+        """Return the parsed template at template_path, reading it only when stale"""
+        key = str(template_path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self.check_mtime:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        # One stat replaces the old exists() + open() probe
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        with open(key, 'r', encoding='utf-8') as f:
+            template = Template(f.read())
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (signature, template)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return template
+
+    def discard(self, template_path: Path):
+        """Drop a single entry from the cache"""
+        with self._lock:
+            self._entries.pop(str(template_path), None)
+
+    def clear(self):
+        """Drop all cached templates and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """Return hit/miss/eviction counters and the current size"""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             self.maxsize, len(self._entries))
+
+
+# Shared by every TemplateManager in the process unless one is given explicitly
+_template_cache = TemplateCache()
+
+
+def get_template_cache() -> TemplateCache:
+    """Return the process-wide template cache"""
+    return _template_cache
+
+
+class RenderMemo:
+    """
+    Memoize renders on the projection of the context onto the template's
+    placeholders, so contexts differing only in unused fields share a render.
+
+    Entries are keyed by template source rather than Template object, so a
+    re-parsed template reuses them and edited-away versions age out of the
+    LRU instead of staying pinned.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._fields: "OrderedDict[str, FrozenSet[str]]" = OrderedDict()
+        self._renders = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def fields(self, template: Template) -> FrozenSet[str]:
+        """Return the ${...} placeholders the template uses"""
+        source = template.template
+        with self._lock:
+            fields = self._fields.get(source)
+            if fields is not None:
+                self._fields.move_to_end(source)
+                return fields
+
+        fields = frozenset(
+            match.group("named") or match.group("braced")
+            for match in template.pattern.finditer(source)
+            if match.group("named") or match.group("braced"))
+        with self._lock:
+            self._fields[source] = fields
+            while len(self._fields) > self.maxsize:
+                self._fields.popitem(last=False)
+        return fields
+
+    def render(self, template: Template, context: dict) -> str:
+        # Fields missing from the context are left verbatim, so only the
+        # present ones form the key
+        try:
+            key = (template.template, tuple(sorted((name, context[name])
+                                          for name in self.fields(template) if name in context)))
+            hash(key)
+        except TypeError:
+            return template.safe_substitute(context)
+
+        with self._lock:
+            rendered = self._renders.get(key)
+            if rendered is not None:
+                self._renders.move_to_end(key)
+                self.hits += 1
+                return rendered
+
+        rendered = template.safe_substitute(context)
+        with self._lock:
+            self.misses += 1
+            self._renders[key] = rendered
+            while len(self._renders) > self.maxsize:
+                self._renders.popitem(last=False)
+                self.evictions += 1
+        return rendered
+
+    def clear(self):
+        """Drop all memoized renders and reset the counters"""
+        with self._lock:
+            self._fields.clear()
+            self._renders.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """Return hit/miss/eviction counters and the current size"""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             self.maxsize, len(self._renders))
+
+
+_render_memo = RenderMemo()
+
+
+def get_render_memo() -> RenderMemo:
+    """Return the process-wide render memo"""
+    return _render_memo
+
+
+class TemplateBundle:
+    """Packaged templates loaded from a single bundle resource"""
+
+    def __init__(self, sources: Dict[str, str]):
+        self.sources = sources
+        self._parsed: Dict[str, Template] = {}
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TemplateBundle":
+        return cls(decode_bundle(data))
+
+    @classmethod
+    def load(cls) -> Optional["TemplateBundle"]:
+        """
+        Read the bundle shipped with the package.
+
+        Returns None if it was not built or cannot be decoded (truncated,
+        corrupt, other version), so lookups fall back to the loose files.
+        """
+        try:
+            if hasattr(resources, "files"):  # Python 3.9+
+                data = resources.files(__name__).joinpath(BUNDLE_NAME).read_bytes()
+            else:
+                data = resources.read_binary(__name__, BUNDLE_NAME)
+            return cls.from_bytes(data)
+        except (OSError, ValueError, zlib.error):
+            return None
+
+    def __contains__(self, template_name: str) -> bool:
+        return template_name in self.sources
+
+    def names(self) -> List[str]:
+        return list(self.sources)
+
+    def get(self, template_name: str) -> Template:
+        template = self._parsed.get(template_name)
+        if template is None:
+            template = self._parsed[template_name] = Template(self.sources[template_name])
+        return template
+
+
+_bundle_lock = threading.Lock()
+_bundle: Optional[TemplateBundle] = None
+_bundle_loaded = False
+
+
+def get_template_bundle() -> Optional[TemplateBundle]:
+    """Return the packaged bundle, reading it at most once per process"""
+    global _bundle, _bundle_loaded
+    if not _bundle_loaded:
+        with _bundle_lock:
+            if not _bundle_loaded:
+                _bundle = TemplateBundle.load()
+                _bundle_loaded = True
+    return _bundle
 
 
 class TemplateManager:
-    """Manage template loading and rendering for embedsmith"""
-    
-    def __init__(self):
-        self.template_dir = Path(__file__).parent
-    
+    """
+    Manage template loading and rendering for embedsmith.
+
+    Templates are looked up in template_dir (user overrides) first, then in
+    the packed bundle, then as loose .j2 files next to this module.
+    """
+
+    def __init__(self, template_dir: Optional[Path] = None, cache: Optional[TemplateCache] = None,
+                 bundle: Optional[TemplateBundle] = None, render_memo: Optional[RenderMemo] = None):
+        self.override_dir = Path(template_dir) if template_dir else None
+        self.template_dir = PACKAGE_DIR
+        self.cache = cache if cache is not None else _template_cache
+        self.render_memo = render_memo if render_memo is not None else _render_memo
+        self.bundle = bundle if bundle is not None else get_template_bundle()
+
     def get_available_templates(self):
         """List all available templates"""
-        return [f.name for f in self.template_dir.glob("*.j2")]
-    
-    def render(self, template_name: str, context: dict) -> str:
-        """Render a template with the given context"""
+        names = set(self.bundle.names()) if self.bundle else set()
+        for directory in (self.override_dir, self.template_dir):
+            if directory is not None:
+                names.update(f.name for f in directory.glob("*.j2"))
+        return sorted(names)
+
+    def get_template(self, template_name: str) -> Template:
+        """Return the parsed template, served from the cache when unchanged"""
+        if self.override_dir is not None:
+            try:
+                return self.cache.get(self.override_dir / template_name)
+            except FileNotFoundError:
+                self.cache.discard(self.override_dir / template_name)
+
+        if self.bundle is not None and template_name in self.bundle:
+            return self.bundle.get(template_name)
+
         template_path = self.template_dir / template_name
-        
-        if not template_path.exists():
+        try:
+            return self.cache.get(template_path)
+        except FileNotFoundError:
+            self.cache.discard(template_path)
             raise FileNotFoundError(f"Template not found: {template_name}")
-        
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
+
+    def render(self, template_name: str, context: dict) -> str:
+        """Render a template with the given context"""
         # Simple template substitutions
-        template = Template(template_content)
-        return template.safe_substitute(context)
\ No newline at end of file
+        return self.render_memo.render(self.get_template(template_name), context)
+
+    def template_fields(self, template_name: str) -> FrozenSet[str]:
+        """Return the context fields a template depends on"""
+        return self.render_memo.fields(self.get_template(template_name))
+
+    def dependency_index(self) -> Dict[str, FrozenSet[str]]:
+        """Map every available template to the context fields it uses"""
+        return {name: self.template_fields(name) for name in self.get_available_templates()}
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics for the template cache used by this manager"""
+        return self.cache.info()
+
+    def render_info(self) -> CacheInfo:
+        """Return statistics for the render memo used by this manager"""
+        return self.render_memo.info()
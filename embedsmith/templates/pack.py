@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Pack the loose .j2 templates into a single bundle resource.
+
+The bundle is a zlib-compressed JSON object mapping template names to their
+source. It is generated at build time (see setup.py) so installed copies
+load every template with one resource read:
+
+    python embedsmith/templates/pack.py [SOURCE_DIR] [OUTPUT]
+
+This module only uses the standard library and no relative imports, so the
+build can run it straight from the source tree.
+"""
+
+import json
+import sys
+import zlib
+from pathlib import Path
+from typing import Dict
+
+BUNDLE_NAME = "templates.bundle"
+BUNDLE_VERSION = 1
+
+
+def encode_bundle(templates: Dict[str, str]) -> bytes:
+    """Serialise name -> source into bundle bytes"""
+    payload = {"version": BUNDLE_VERSION, "templates": dict(sorted(templates.items()))}
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def decode_bundle(data: bytes) -> Dict[str, str]:
+    """Parse bundle bytes back into name -> source"""
+    payload = json.loads(zlib.decompress(data).decode("utf-8"))
+    if not isinstance(payload, dict) or payload.get("version") != BUNDLE_VERSION:
+        version = payload.get("version") if isinstance(payload, dict) else None
+        raise ValueError(f"Unsupported template bundle version: {version}")
+    if not isinstance(payload.get("templates"), dict):
+        raise ValueError("Template bundle has no template table")
+    return payload["templates"]
+
+
+def pack_templates(source_dir, output_path) -> int:
+    """Pack every *.j2 in source_dir into output_path; return the template count"""
+    templates = {path.name: path.read_text(encoding="utf-8")
+                 for path in sorted(Path(source_dir).glob("*.j2"))}
+    Path(output_path).write_bytes(encode_bundle(templates))
+    return len(templates)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    source_dir = Path(argv[0]) if argv else Path(__file__).resolve().parent
+    output_path = Path(argv[1]) if len(argv) > 1 else source_dir / BUNDLE_NAME
+    count = pack_templates(source_dir, output_path)
+    print(f"📦 Packed {count} templates into {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,20 @@
+import runpy
+from pathlib import Path
+
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithTemplateBundle(build_py):
+    """Pack the .j2 templates into a single bundle resource at build time"""
+
+    def run(self):
+        super().run()
+        if not self.dry_run:
+            pack = runpy.run_path(str(Path("embedsmith") / "templates" / "pack.py"))
+            target = Path(self.build_lib) / "embedsmith" / "templates" / pack["BUNDLE_NAME"]
+            pack["pack_templates"](Path("embedsmith") / "templates", target)
+
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -35,7 +51,8 @@ setup(
     },
     include_package_data=True,
     package_data={
-        "embeddedsmith": ["templates/*.j2"],
+        "embedsmith.templates": ["*.j2", "templates.bundle"],
     },
+    cmdclass={"build_py": BuildPyWithTemplateBundle},
     keywords="embedded, firmware, project, template, mcu, boilerplate, generator",
 )
\ No newline at end of file
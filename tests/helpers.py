@@ -0,0 +1,36 @@
+import importlib.util
+import shutil
+import tempfile
+from pathlib import Path
+from embedsmith import EmbeddedProjectCreator, ProjectConfig
+from embedsmith.events import SilentSink
+
+
+def load_script(path: Path):
+    """Import a generated script (tools/scripts/*.py, tests/unit/*.py) by path"""
+    spec = importlib.util.spec_from_file_location(path.stem, str(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class GeneratedProjectTest:
+    """Base for test classes that generate full projects into a temporary directory"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+        self.base_path = self.temp_path / "project"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_project(self, base_path=None, **options) -> Path:
+        """Generate a project from ProjectConfig(**options); defaults to self.base_path"""
+        base_path = base_path or self.base_path
+        creator = EmbeddedProjectCreator(str(base_path), ProjectConfig(**options), events=SilentSink())
+        assert creator.create_project()
+        return base_path
+
+    def load_script(self, relative_path: str, base_path=None):
+        return load_script((base_path or self.base_path) / relative_path)
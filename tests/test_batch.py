@@ -0,0 +1,83 @@
+import json
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from embedsmith import embedsmith_batch, load_manifest, BatchJob
+from embedsmith.cli import main
+
+
+class TestBatch:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_load_jsonl_manifest(self):
+        manifest = self.temp_path / "boards.jsonl"
+        manifest.write_text(
+            json.dumps({"path": "a", "mcu": "cortex-m7"}) + "\n\n" +
+            json.dumps({"path": "b", "config": {"flash_size": "1M"}}) + "\n"
+        )
+
+        batch_jobs = load_manifest(str(manifest))
+
+        assert batch_jobs == [BatchJob("a", {"mcu": "cortex-m7"}), BatchJob("b", {"flash_size": "1M"})]
+
+    def test_load_json_manifest_with_defaults(self):
+        manifest = self.temp_path / "boards.json"
+        manifest.write_text(json.dumps({
+            "defaults": {"author": "Fleet"},
+            "projects": [{"path": "a", "mcu": "cortex-m0"}],
+        }))
+
+        assert load_manifest(str(manifest)) == [BatchJob("a", {"author": "Fleet", "mcu": "cortex-m0"})]
+
+    def test_unknown_field_is_rejected(self):
+        manifest = self.temp_path / "boards.jsonl"
+        manifest.write_text(json.dumps({"path": "a", "cpu": "m4"}) + "\n")
+
+        with pytest.raises(ValueError, match="cpu"):
+            load_manifest(str(manifest))
+
+    def test_process_pool_generates_all_projects(self):
+        batch_jobs = [BatchJob(str(self.temp_path / mcu), {"mcu": mcu})
+                      for mcu in ("cortex-m0", "cortex-m4", "cortex-m7")]
+
+        results = list(embedsmith_batch(batch_jobs, processes=2))
+
+        assert sorted(result.path for result in results) == sorted(job.path for job in batch_jobs)
+        assert all(result.success and result.files for result in results)
+        assert "cortex-m7" in (self.temp_path / "cortex-m7" / "firmware" / "Makefile").read_text()
+
+    def test_existing_directory_requires_overwrite(self):
+        (self.temp_path / "a").mkdir()
+
+        results = list(embedsmith_batch([BatchJob(str(self.temp_path / "a"))], processes=1))
+
+        assert not results[0].success
+        assert "exists" in results[0].error
+
+    def test_cli_batch_subcommand(self, capsys):
+        manifest = self.temp_path / "boards.jsonl"
+        manifest.write_text(json.dumps({"path": str(self.temp_path / "a")}) + "\n")
+
+        with pytest.raises(SystemExit) as exit_info:
+            main(["batch", str(manifest), "--processes", "1"])
+
+        assert exit_info.value.code == 0
+        assert "1/1 projects" in capsys.readouterr().out
+        assert (self.temp_path / "a" / "firmware" / "Makefile").exists()
+
+    def test_config_variants_reuse_renders(self):
+        batch_jobs = [BatchJob(str(self.temp_path / mcu), {"mcu": mcu, "author": "Render Memo"})
+                      for mcu in ("cortex-m0", "cortex-m4", "cortex-m7")]
+
+        results = list(embedsmith_batch(batch_jobs, processes=1))
+
+        # Templates that never mention the MCU are rendered once for all three
+        assert results[0].render_misses > 0
+        assert all(result.render_hits > 0 for result in results[1:])
+        assert "cortex-m4" in (self.temp_path / "cortex-m4" / "firmware" / "Makefile").read_text()
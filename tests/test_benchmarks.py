@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from tests.helpers import GeneratedProjectTest
+
+BENCHMARK = Path(__file__).resolve().parent.parent / "benchmarks" / "bench_embedsmith.py"
+
+
+class TestBenchmarks(GeneratedProjectTest):
+    def setup_method(self):
+        super().setup_method()
+        self.report_path = self.temp_path / "bench.json"
+
+    def run(self, *args):
+        return subprocess.run(
+            [sys.executable, str(BENCHMARK), "--repeat", "1", "--batch-projects", "2",
+             "--disk-dir", self.temp_dir] + list(args),
+            capture_output=True, text=True)
+
+    def test_report_is_machine_readable(self):
+        result = self.run("--output", str(self.report_path))
+        assert result.returncode == 0, result.stderr
+
+        report = json.loads(self.report_path.read_text())
+        results = report["results"]
+        assert report["embedsmith_version"]
+        assert "render.warm.makefile.j2" in results
+        assert "get_files_to_create" in results
+        assert "create_project.disk.jobs1" in results
+        assert "cli.help" in results
+        assert results["batch"]["projects"] == 2
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {"get_files_to_create": {"min": 1e-9}}}
+        baseline_path = self.temp_path / "baseline.json"
+        baseline_path.write_text(json.dumps(baseline))
+
+        result = self.run("--output", str(self.report_path), "--compare", str(baseline_path))
+
+        assert result.returncode == 1
+        assert "get_files_to_create" in result.stderr
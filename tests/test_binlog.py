@@ -0,0 +1,94 @@
+import os
+import shutil
+import subprocess
+import time
+import pytest
+from embedsmith.core import BINARY_LOG_FILES
+from tests.helpers import GeneratedProjectTest
+
+
+needs_gcc = pytest.mark.skipif(not shutil.which("gcc"), reason="host gcc is required")
+
+
+class TestBinaryLog(GeneratedProjectTest):
+    def create(self, base_path=None, **options):
+        base_path = self.create_project(base_path, **options)
+        return self.load_script("tools/scripts/debug_tool.py", base_path)
+
+    def build_test_program(self):
+        host_build = self.load_script("tests/unit/host_build.py")
+        build = host_build.HostBuild(cache_dir=self.temp_path / "cache", extra_flags=["-Wpedantic", "-Werror"])
+        return build.build([host_build.TEST_DIR / "test_binlog.c"])["test_binlog"]
+
+    def test_binary_log_is_opt_in(self):
+        plain = self.temp_path / "plain"
+        self.create(plain)
+        assert not any((plain / path).exists() for _, path in BINARY_LOG_FILES)
+        assert "BINLOG ?= 0" in (plain / "firmware" / "Makefile").read_text()
+
+        self.create(binary_log=True)
+        assert all((self.base_path / path).exists() for _, path in BINARY_LOG_FILES)
+        assert "BINLOG ?= 1" in (self.base_path / "firmware" / "Makefile").read_text()
+        linker_script = (self.base_path / "firmware" / "linker_scripts" / "linker_script.ld").read_text()
+        assert "binlog_strings 0 (INFO)" in linker_script
+
+    def test_format_compilation(self):
+        debug_tool = self.create()
+        INT, FLOAT, STRING = debug_tool.ARG_INT, debug_tool.ARG_FLOAT, debug_tool.ARG_STRING
+
+        args, template = debug_tool.compile_format("%d%% of %s at %5.2f (%hhu, %08lx, %llu, %p)")
+        assert [kind for kind, _ in args] == [INT, STRING, FLOAT, INT, INT, INT, INT]
+        assert [mask for _, mask in args] == [None, None, None, 0xFF, 0xFFFFFFFF, 2 ** 64 - 1, 2 ** 64 - 1]
+        assert template == "%d%% of %s at %5.2f (%d, %08x, %d, 0x%x)"
+        assert template % (50, "pump", 1.5, 7, 0xBEEF, 2 ** 40, 0x2000) == \
+            "50% of pump at  1.50 (7, 0000beef, 1099511627776, 0x2000)"
+
+        assert debug_tool.cobs_decode(bytes([1, 1, 1])) == b"\0\0"
+        assert debug_tool.cobs_decode(bytes([3, 5, 6, 2, 7])) == bytes([5, 6, 0, 7])
+        with pytest.raises(ValueError):
+            debug_tool.cobs_decode(bytes([5, 1]))
+
+    @needs_gcc
+    def test_generated_host_test_passes(self):
+        self.create(binary_log=True)
+        binary = self.build_test_program()
+
+        result = subprocess.run([str(binary)], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                universal_newlines=True, timeout=120)
+        assert result.returncode == 0, result.stdout
+        assert "4/4 passed" in result.stdout and "ns/record" in result.stdout
+
+    @needs_gcc
+    def test_stream_decodes_in_any_chunking_and_resynchronises(self):
+        debug_tool = self.create(binary_log=True)
+        binary = self.build_test_program()
+        stream = self.temp_path / "stream.bin"
+        subprocess.run([str(binary)], env=dict(os.environ, BINLOG_STREAM=str(stream), BINLOG_STREAM_RECORDS="20000"),
+                       stdout=subprocess.DEVNULL, check=True, timeout=120)
+        table = debug_tool.StringTable.load(binary)
+        data = stream.read_bytes()
+
+        decoder = debug_tool.BinaryLogDecoder(table)
+        start = time.perf_counter()
+        records = decoder.feed(data)
+        rate = len(records) / (time.perf_counter() - start)
+        assert (len(records), decoder.errors) == (20000, 0)
+        assert rate > 20000, f"decoded only {rate:.0f} records/s"
+        assert records[5].message == "temperature 20.62 C, fan 5%"
+
+        chunked = debug_tool.BinaryLogDecoder(table)
+        pieces = [chunked.feed(data[offset:offset + 7]) for offset in range(0, len(data), 7)]
+        assert [record for piece in pieces for record in piece] == records
+
+        # A corrupted frame is skipped and decoding picks up at the next delimiter
+        damaged = bytearray(data)
+        first_end = damaged.index(0)
+        damaged[1:first_end] = b"\xff" * (first_end - 1)
+        decoder = debug_tool.BinaryLogDecoder(table)
+        assert decoder.feed(bytes(damaged)) == records[1:]
+        assert decoder.errors == 1
+
+        # The raw table dumped by the Makefile decodes the same records
+        dumped = self.temp_path / "table.binlog"
+        dumped.write_bytes(debug_tool.read_elf_section(binary.read_bytes(), debug_tool.BINLOG_SECTION))
+        assert debug_tool.BinaryLogDecoder(debug_tool.StringTable.load(dumped)).feed(data) == records
@@ -0,0 +1,172 @@
+import json
+import os
+import shutil
+import subprocess
+import pytest
+from tests.helpers import GeneratedProjectTest
+
+
+# Build the generated Makefile with the host compiler instead of the target toolchain
+HOST_OVERRIDES = ["CC=gcc", "CPUFLAGS=", "LDFLAGS=", "CCACHE="]
+
+pytestmark = pytest.mark.skipif(not (shutil.which("gcc") and shutil.which("make")),
+                                reason="host gcc and make are required")
+
+
+class TestGeneratedMakefile(GeneratedProjectTest):
+    def setup_method(self):
+        super().setup_method()
+        self.firmware = self.create_project(flash_size="64K", ram_size="16K") / "firmware"
+
+        # Minimal host-buildable sources in place of the target code
+        for source in list((self.firmware / "src").glob("*.c")) + list((self.firmware / "drivers").glob("*.c")):
+            source.unlink()
+        (self.firmware / "include" / "answer.h").write_text("#define ANSWER 42\n")
+        (self.firmware / "src" / "main.c").write_text(
+            '#include "answer.h"\nint helper(void);\nint main(void) { return helper() - ANSWER; }\n')
+        (self.firmware / "src" / "helper.c").write_text("int helper(void) { return 42; }\n")
+
+    def make(self, *args):
+        return subprocess.run(["make", "-C", str(self.firmware), *HOST_OVERRIDES, *args],
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+
+    def test_second_build_is_a_no_op(self):
+        first = self.make("-j4")
+        assert first.returncode == 0, first.stdout
+        assert (self.firmware / "build" / "firmware.elf").exists()
+
+        second = self.make("-j4")
+        assert second.returncode == 0, second.stdout
+        assert "Compiling" not in second.stdout and "Linking" not in second.stdout
+        # --question exits 0 only when every target is up to date
+        assert self.make("--question").returncode == 0
+
+    def test_header_change_rebuilds_dependents_only(self):
+        assert self.make().returncode == 0
+        header = self.firmware / "include" / "answer.h"
+        stat = header.stat()
+        os.utime(header, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        rebuild = self.make()
+
+        assert rebuild.returncode == 0, rebuild.stdout
+        assert "Compiling src/main.c" in rebuild.stdout
+        assert "Compiling src/helper.c" not in rebuild.stdout
+
+    def test_compile_commands(self):
+        assert self.make().returncode == 0
+
+        commands = json.loads((self.firmware / "compile_commands.json").read_text())
+
+        assert sorted(entry["file"] for entry in commands) == ["src/helper.c", "src/main.c"]
+        assert all(entry["directory"] == str(self.firmware) and "-c" in entry["command"] for entry in commands)
+
+    def test_release_profiles_link_with_lto(self):
+        for profile in ("release-speed", "release-size"):
+            build = self.make("PROFILE=" + profile)
+            assert build.returncode == 0, build.stdout
+            assert "Linking build/firmware.elf (" + profile + ")" in build.stdout
+
+        commands = json.loads((self.firmware / "compile_commands.json").read_text())
+        assert all("-Os -flto" in entry["command"] for entry in commands)
+        # Objects are kept per profile, so switching back only relinks
+        back = self.make("PROFILE=release-speed")
+        assert "Compiling" not in back.stdout and "Linking" in back.stdout
+
+    def test_binutils_follow_the_compiler_prefix(self):
+        def tools(*overrides):
+            result = subprocess.run(
+                ["make", "-s", "-C", str(self.firmware), *overrides,
+                 "--eval", "print-tools: ; @echo $(OBJCOPY) $(SIZE) $(GDB)", "print-tools"],
+                stdout=subprocess.PIPE, universal_newlines=True)
+            return result.stdout.split()
+
+        assert tools() == ["arm-none-eabi-objcopy", "arm-none-eabi-size", "arm-none-eabi-gdb"]
+        assert tools("CC=riscv-none-elf-gcc")[0] == "riscv-none-elf-objcopy"
+        assert tools("CC=gcc") == ["objcopy", "size", "gdb"]
+
+    def test_binary_log_string_table_is_dumped(self):
+        (self.firmware / "src" / "strings.c").write_text(
+            '__attribute__((section("binlog_strings"), used)) static const char entry[] = "I:main.c:1:hello";\n')
+
+        build = self.make("BINLOG=1")
+
+        assert build.returncode == 0, build.stdout
+        assert b"hello" in (self.firmware / "build" / "firmware.binlog").read_bytes()
+
+    def test_size_budget_fails_the_build(self):
+        # 64K flash / 16K RAM from the config
+        assert "FLASH_BUDGET ?= 65536" in (self.firmware / "Makefile").read_text()
+
+        build = self.make("TEXT_BUDGET=64")
+
+        assert build.returncode != 0
+        assert ".text is" in build.stdout and "budget 64" in build.stdout
+        assert not (self.firmware / "build" / "firmware.elf").exists()
+        assert self.make().returncode == 0
+
+
+class TestGeneratedSources(GeneratedProjectTest):
+    def setup_method(self):
+        super().setup_method()
+        self.firmware = self.create_project(mcu="cortex-m7", ram_code=True, driver_pack=True,
+                                            binary_log=True) / "firmware"
+
+    def makefile_cflags(self):
+        result = subprocess.run(
+            ["make", "-s", "-C", str(self.firmware), *HOST_OVERRIDES,
+             "--eval", "print-cflags: ; @echo $(CFLAGS)", "print-cflags"],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        assert result.returncode == 0, result.stdout
+        return result.stdout.split()
+
+    def test_sources_compile_cleanly_with_makefile_cflags(self):
+        cflags = self.makefile_cflags()
+        assert "-DMCU_CORTEX_M7" in cflags
+
+        # main.c is an application skeleton that calls the vendor HAL
+        sources = [source for source in sorted(self.firmware.glob("*/*.c")) if source.name != "main.c"]
+        assert {"system.c", "startup.c", "uart.c", "binlog.c"} <= {source.name for source in sources}
+        for source in sources:
+            result = subprocess.run(["gcc", "-fsyntax-only", "-Werror", *cflags, source.relative_to(self.firmware)],
+                                    cwd=str(self.firmware), stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    universal_newlines=True)
+            assert result.returncode == 0, result.stdout
+
+
+class TestRamCodePlacement(GeneratedProjectTest):
+    def setup_method(self):
+        super().setup_method()
+        self.firmware = self.create_project(mcu="cortex-m7", ram_code=True) / "firmware"
+
+    def test_sections_link_at_their_run_addresses(self):
+        # The host libc/libm archives are linker scripts, so drop the /DISCARD/ block
+        script = (self.firmware / "linker_scripts" / "linker_script.ld").read_text()
+        host_script = self.temp_path / "host.ld"
+        host_script.write_text(script[:script.index("    /* Remove information")] + "}\n")
+        source = self.temp_path / "placed.c"
+        source.write_text(
+            '#include "config.h"\n'
+            "ITCM_FUNC int hot(int x) { return x * 3; }\n"
+            "RAMFUNC int warm(int x) { return x + 1; }\n"
+            "DTCM_DATA int table[4] = {1, 2, 3, 4};\n"
+            "DTCM_BSS int scratch[8];\n"
+            "int main(void) { scratch[0] = hot(table[1]); return warm(scratch[0]); }\n")
+        elf = self.temp_path / "placed.elf"
+
+        link = subprocess.run(
+            ["gcc", "-O2", "-Wall", "-Werror", "-ffreestanding", "-nostdlib", "-static", "-no-pie", "-fno-pic",
+             "-I" + str(self.firmware / "include"), "-T", str(host_script), "-e", "Reset_Handler",
+             str(self.firmware / "src" / "startup.c"), str(source), "-o", str(elf)],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        assert link.returncode == 0, link.stdout
+
+        nm = subprocess.run(["nm", str(elf)], stdout=subprocess.PIPE, universal_newlines=True).stdout
+        symbols = {line.split()[2]: int(line.split()[0], 16) for line in nm.splitlines()}
+        assert symbols["hot"] < 0x4000                            # ITCM
+        assert 0x20000000 <= symbols["table"] < 0x20020000        # DTCM
+        assert 0x20000000 <= symbols["scratch"] < 0x20020000
+        assert symbols["warm"] >= 0x20020000                      # RAM, with .data
+        # Load images follow each other in flash, word aligned
+        assert symbols["_sidata"] < symbols["_siitcm"] < symbols["_sidtcm_data"] < 0x08100000
+        assert all(symbols[name] % 4 == 0 for name in ("_sidata", "_siitcm", "_sidtcm_data"))
@@ -0,0 +1,203 @@
+import os
+import pytest
+import json
+import hashlib
+import tempfile
+import shutil
+from pathlib import Path
+from embedsmith import ProjectConfig, EmbeddedProjectCreator
+from embedsmith.core import parse_size
+from embedsmith.templates import TemplateManager, TemplateCache
+
+
+class TestProjectPlan:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir) / "test-project"
+        self.cache = TemplateCache()
+        self.creator = EmbeddedProjectCreator(str(self.base_path), ProjectConfig(mcu="cortex-m7"))
+        self.creator.template_manager = TemplateManager(cache=self.cache)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_plan_is_lazy(self):
+        plan = list(self.creator.iter_files())
+
+        assert self.cache.info().misses == 0
+        assert plan[0].template == "makefile.j2"
+        assert plan[0].path == self.base_path / "firmware" / "Makefile"
+        assert plan[-1].path == self.base_path / "embedsmith.json"
+
+    def test_filtered_plan_renders_only_selected(self):
+        selected = [planned for planned in self.creator.iter_files()
+                    if planned.template == "makefile.j2"]
+
+        assert "cortex-m7" in selected[0].render()
+        assert self.cache.info().misses == 1
+
+    def test_every_planned_template_exists(self):
+        available = set(self.creator.template_manager.get_available_templates())
+        for planned in self.creator.iter_files():
+            assert planned.template is None or planned.template in available
+
+    def test_create_project_writes_plan(self):
+        assert self.creator.create_project(overwrite=True)
+
+        for planned in self.creator.iter_files():
+            assert planned.path.read_text(encoding="utf-8") == planned.render()
+        metadata = json.loads((self.base_path / "embedsmith.json").read_text())
+        assert metadata["mcu"] == "cortex-m7"
+
+
+class TestParallelEmission:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def read_tree(self, root):
+        return {str(path.relative_to(root)): path.read_bytes()
+                for path in sorted(root.rglob("*")) if path.is_file()}
+
+    def test_parallel_matches_sequential(self):
+        sequential = EmbeddedProjectCreator(str(self.temp_path / "seq"))
+        parallel = EmbeddedProjectCreator(str(self.temp_path / "par"), jobs=4)
+
+        assert sequential.create_project(overwrite=True)
+        assert parallel.create_project(overwrite=True)
+        assert self.read_tree(self.temp_path / "seq") == self.read_tree(self.temp_path / "par")
+        assert (self.temp_path / "par" / "tools" / "scripts" / "flash_tool.py").stat().st_mode & 0o111
+
+    def test_parallel_aggregates_errors(self):
+        base_path = self.temp_path / "broken"
+        (base_path / "firmware" / "Makefile").mkdir(parents=True)
+        (base_path / "LICENSE").mkdir(parents=True)
+
+        creator = EmbeddedProjectCreator(str(base_path), jobs=4)
+
+        assert not creator.create_project(overwrite=True)
+        assert [path for path, _ in creator.errors] == [
+            base_path / "firmware" / "Makefile",
+            base_path / "LICENSE",
+        ]
+        assert (base_path / "firmware" / "src" / "main.c").exists()
+        assert (base_path / "embedsmith.json").exists()
+
+
+class TestIncrementalRegeneration:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir) / "test-project"
+        EmbeddedProjectCreator(str(self.base_path)).create_project(overwrite=True)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_metadata_records_hashes(self):
+        metadata = json.loads((self.base_path / "embedsmith.json").read_text())
+
+        assert metadata["generated_files"]["firmware/Makefile"].startswith("sha256:")
+        assert metadata["project_name"] == "firmware"
+
+    def test_unchanged_files_are_not_rewritten(self):
+        makefile = self.base_path / "firmware" / "Makefile"
+        mtime = makefile.stat().st_mtime_ns - 10**9
+        os.utime(makefile, ns=(mtime, mtime))
+
+        creator = EmbeddedProjectCreator(str(self.base_path))
+        assert creator.create_project(overwrite=True)
+
+        assert makefile.stat().st_mtime_ns == mtime
+        assert creator.report.written == []
+        assert makefile in creator.report.unchanged
+
+    def test_config_change_rewrites_affected_files(self):
+        creator = EmbeddedProjectCreator(str(self.base_path), ProjectConfig(mcu="cortex-m7"))
+        assert creator.create_project(overwrite=True)
+
+        assert self.base_path / "firmware" / "Makefile" in creator.report.written
+        assert self.base_path / "LICENSE" in creator.report.unchanged
+
+    def test_user_edits_are_reported_not_clobbered(self):
+        main_c = self.base_path / "firmware" / "src" / "main.c"
+        main_c.write_text("// my code\n")
+
+        for jobs in (1, 4):
+            creator = EmbeddedProjectCreator(str(self.base_path), ProjectConfig(mcu="cortex-m7"), jobs)
+            assert creator.create_project(overwrite=True)
+            assert creator.report.conflicts == [main_c]
+            assert main_c.read_text() == "// my code\n"
+
+        creator = EmbeddedProjectCreator(str(self.base_path), overwrite_edited=True)
+        assert creator.create_project(overwrite=True)
+        assert main_c in creator.report.written
+        assert "cortex-m4" in main_c.read_text()
+
+    def record_stale_file(self, relative_path, content):
+        metadata_path = self.base_path / "embedsmith.json"
+        metadata = json.loads(metadata_path.read_text())
+        (self.base_path / relative_path).write_text(content)
+        metadata["generated_files"][relative_path] = "sha256:" + hashlib.sha256(content.encode()).hexdigest()
+        metadata_path.write_text(json.dumps(metadata))
+
+    def test_prune_removes_stale_generated_files(self):
+        self.record_stale_file("docs/old.md", "old\n")
+        self.record_stale_file("docs/edited.md", "old\n")
+        (self.base_path / "docs" / "edited.md").write_text("mine\n")
+
+        creator = EmbeddedProjectCreator(str(self.base_path), prune=True)
+        assert creator.create_project(overwrite=True)
+
+        assert creator.report.pruned == [self.base_path / "docs" / "old.md"]
+        assert not (self.base_path / "docs" / "old.md").exists()
+        assert (self.base_path / "docs" / "edited.md").read_text() == "mine\n"
+        # The edited file stays tracked so a later run can still prune it
+        metadata = json.loads((self.base_path / "embedsmith.json").read_text())
+        assert "docs/edited.md" in metadata["generated_files"]
+        assert "docs/old.md" not in metadata["generated_files"]
+
+    def test_prune_ignores_paths_outside_the_project(self):
+        outside = Path(self.temp_dir) / "outside.txt"
+        outside.write_text("keep\n")
+        self.record_stale_file("docs/old.md", "keep\n")
+        metadata_path = self.base_path / "embedsmith.json"
+        metadata = json.loads(metadata_path.read_text())
+        metadata["generated_files"]["../outside.txt"] = metadata["generated_files"].pop("docs/old.md")
+        metadata_path.write_text(json.dumps(metadata))
+
+        assert EmbeddedProjectCreator(str(self.base_path), prune=True).create_project(overwrite=True)
+
+        assert outside.read_text() == "keep\n"
+
+
+class TestProjectConfig:
+    def test_parse_size(self):
+        assert parse_size("512K") == 512 * 1024
+        assert parse_size("1M") == 1024 * 1024
+        assert parse_size("64kb") == 64 * 1024
+        assert parse_size("0x8000") == 0x8000
+        assert parse_size("4096") == 4096
+
+    def test_invalid_values_are_rejected(self):
+        with pytest.raises(ValueError, match="profile"):
+            ProjectConfig(build_profile="fast")
+        with pytest.raises(ValueError, match="memory size"):
+            ProjectConfig(flash_size="lots")
+        for name in ("", ".", "..", "a/b", "a\\b"):
+            with pytest.raises(ValueError, match="project name"):
+                ProjectConfig(project_name=name)
+
+    def test_cli_reports_invalid_values_without_a_traceback(self, tmp_path, capsys):
+        from embedsmith.cli import main
+
+        for args in (["--flash-size", "12Q"], ["--name", "../x"]):
+            for extra in ([], ["--archive", str(tmp_path / "project.zip")]):
+                with pytest.raises(SystemExit) as exit_info:
+                    main([str(tmp_path / "project"), *args, *extra])
+                assert exit_info.value.code == 1
+                err = capsys.readouterr().err
+                assert err.startswith("❌ Invalid configuration") and "Traceback" not in err
+        assert not any(tmp_path.iterdir())
@@ -0,0 +1,60 @@
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+import tempfile
+from pathlib import Path
+from embedsmith import EmbeddedProjectCreator, ProjectConfig
+from embedsmith.core import DRIVER_PACK_FILES
+from embedsmith.events import SilentSink
+
+
+needs_gcc = pytest.mark.skipif(not shutil.which("gcc"), reason="host gcc is required")
+
+
+class TestDriverPack:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir) / "project"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create(self, base_path=None, **options):
+        config = ProjectConfig(**options)
+        creator = EmbeddedProjectCreator(str(base_path or self.base_path), config, events=SilentSink())
+        assert creator.create_project()
+
+    def test_driver_pack_is_opt_in(self):
+        plain = Path(self.temp_dir) / "plain"
+        self.create(plain)
+        assert not any((plain / path).exists() for _, path in DRIVER_PACK_FILES)
+
+        self.create(driver_pack=True)
+        assert all((self.base_path / path).exists() for _, path in DRIVER_PACK_FILES)
+
+    @needs_gcc
+    def test_drivers_compile_cleanly(self):
+        self.create(driver_pack=True, ram_code=True)
+        firmware = self.base_path / "firmware"
+
+        for source in ("uart.c", "spi.c"):
+            result = subprocess.run(
+                ["gcc", "-std=c11", "-fsyntax-only", "-Wall", "-Wextra", "-Wpedantic", "-Werror",
+                 "-I" + str(firmware / "include"), "-I" + str(firmware / "drivers"),
+                 str(firmware / "drivers" / source)],
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+            assert result.returncode == 0, result.stdout
+
+    @needs_gcc
+    def test_generated_stress_test_passes(self):
+        self.create(driver_pack=True)
+
+        result = subprocess.run(
+            [sys.executable, "-m", "unittest", "-v", "test_main.TestRingBuffer"],
+            cwd=str(self.base_path / "tests" / "unit"), env=dict(os.environ, RING_STRESS_MB="8"),
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, timeout=300)
+
+        assert result.returncode == 0, result.stdout
+        assert "ring buffer:" in result.stdout and "MB/s over 8 MB" in result.stdout
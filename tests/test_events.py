@@ -0,0 +1,58 @@
+import io
+import json
+import tempfile
+import shutil
+from pathlib import Path
+from embedsmith import EmbeddedProjectCreator
+from embedsmith.events import HumanSink, JsonLinesSink, SilentSink, FILE, PHASE_END, ERROR
+
+
+class TestEvents:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir) / "test-project"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_callback_receives_file_events(self):
+        events = []
+        creator = EmbeddedProjectCreator(str(self.base_path), events=events.append)
+
+        assert creator.create_project()
+
+        files = [event for event in events if event.kind == FILE]
+        makefile = files[0]
+        assert makefile.path == self.base_path / "firmware" / "Makefile"
+        assert makefile.status == "written"
+        assert makefile.size == (self.base_path / "firmware" / "Makefile").stat().st_size
+        assert [event.phase for event in events if event.kind == PHASE_END] == ["directories", "files", "project"]
+
+    def test_silent_sink_prints_nothing(self, capsys):
+        creator = EmbeddedProjectCreator(str(self.base_path), events=SilentSink())
+
+        assert creator.create_project()
+        creator.print_structure()
+        assert capsys.readouterr().out == ""
+
+    def test_json_lines_include_phase_timings(self):
+        stream = io.StringIO()
+        creator = EmbeddedProjectCreator(str(self.base_path), jobs=4, events=JsonLinesSink(stream))
+
+        assert creator.create_project()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        project = records[-1]
+        assert project["event"] == "phase_end" and project["phase"] == "project"
+        assert set(project["phases"]) == {"directories", "files"}
+        assert all("bytes" in record and "duration" in record
+                   for record in records if record["event"] == "file")
+
+    def test_quiet_human_sink_reports_only_errors(self):
+        (self.base_path / "LICENSE").mkdir(parents=True)
+        stream = io.StringIO()
+        creator = EmbeddedProjectCreator(str(self.base_path), events=HumanSink(stream, quiet=True))
+
+        assert not creator.create_project(overwrite=True)
+        assert stream.getvalue().startswith("❌ Error creating")
+        assert len(stream.getvalue().splitlines()) == 1
@@ -0,0 +1,136 @@
+import io
+import os
+import random
+import sys
+import pytest
+import time
+from tests.helpers import GeneratedProjectTest
+
+pytest.importorskip("serial")
+pytestmark = pytest.mark.skipif(sys.platform.startswith("win"), reason="the fake target needs a pty")
+
+
+class TestDeltaFlashing(GeneratedProjectTest):
+    def setup_method(self):
+        super().setup_method()
+        self.create_project()
+        self.flash_tool = self.load_script("tools/scripts/flash_tool.py")
+        self.fake_target = self.load_script("tools/scripts/fake_target.py")
+
+        self.target = self.fake_target.FakeTarget(flash_size=128 * 1024, sector_size=4096, max_chunk=512)
+        self.tool = self.flash_tool.FlashTool(self.target.start())
+        assert self.tool.connect()
+        self.firmware = self.temp_path / "firmware.bin"
+        self.manifest = self.temp_path / "flash_manifest.json"
+
+    def teardown_method(self):
+        self.tool.disconnect()
+        self.target.stop()
+        super().teardown_method()
+
+    def flash(self, image: bytes, **options):
+        self.firmware.write_bytes(image)
+        self.target.erased_sectors.clear()
+        return self.tool.flash_binary(str(self.firmware), str(self.manifest), **options)
+
+    def test_only_changed_sectors_are_programmed(self, capsys):
+        image = bytes(random.Random(7).getrandbits(8) for _ in range(40000))
+        assert self.flash(image, window=8)
+        assert bytes(self.target.flash[:len(image)]) == image
+        assert self.target.erased_sectors == list(range(10))
+
+        patched = bytearray(image)
+        patched[20000] ^= 0x01
+        assert self.flash(bytes(patched))
+
+        assert self.target.erased_sectors == [4]
+        assert bytes(self.target.flash[:len(image)]) == patched
+        # The second run trusted the manifest instead of hashing the target
+        assert self.target.hash_requests == 1
+        assert "1/10 sectors programmed (hashes from manifest)" in capsys.readouterr().out
+
+    def test_stale_manifest_is_caught_by_the_image_crc(self):
+        image = bytes(range(256)) * 64
+        assert self.flash(image)
+        # Reprogrammed by something else since the manifest was written
+        self.target.flash[5000] = 0x00
+
+        assert self.flash(image)
+
+        assert self.target.erased_sectors == [1]
+        assert bytes(self.target.flash[:len(image)]) == image
+
+    def test_full_flash_and_errors(self, capsys):
+        image = b"\x42" * 9000
+        assert self.flash(image)
+        assert self.flash(image, full=True)
+        assert self.target.erased_sectors == [0, 1, 2]
+
+        assert not self.flash(b"\x00" * (256 * 1024))
+        assert "Flash failed: image is 262144 bytes" in capsys.readouterr().out
+
+
+class TestGangFlashing(GeneratedProjectTest):
+    def setup_method(self):
+        super().setup_method()
+        self.create_project()
+        self.flash_tool = self.load_script("tools/scripts/flash_tool.py")
+        self.fake_target = self.load_script("tools/scripts/fake_target.py")
+        self.targets = []
+
+    def teardown_method(self):
+        for target in self.targets:
+            target.stop()
+        super().teardown_method()
+
+    def start_target(self, **options):
+        target = self.fake_target.FakeTarget(flash_size=64 * 1024, sector_size=1024, **options)
+        target.start()
+        self.targets.append(target)
+        return target
+
+    def test_discovery_probes_ports_concurrently(self):
+        boards = [self.start_target() for _ in range(3)]
+        # A port that opens but never answers, and one that does not exist
+        master, slave = os.openpty()
+        try:
+            ports = [os.ttyname(slave), "/dev/does-not-exist"] + [board.port for board in boards]
+            start = time.perf_counter()
+            devices = self.flash_tool.discover_devices(ports, timeout=0.5)
+            elapsed = time.perf_counter() - start
+        finally:
+            os.close(master)
+            os.close(slave)
+
+        assert [port for port, _ in devices] == [board.port for board in boards]
+        assert [info.uid for _, info in devices] == [board.uid for board in boards]
+        assert elapsed < 1.5
+
+    def test_flash_all_with_retries_and_table(self):
+        image = bytes(random.Random(3).getrandbits(8) for _ in range(10000))
+        healthy = [self.start_target(write_delay=0.002) for _ in range(4)]
+        flaky = self.start_target(fail_writes=1)
+        broken = self.start_target(fail_writes=-1)
+        boards = healthy + [flaky, broken]
+        progress = io.StringIO()
+
+        results = self.flash_tool.flash_all(
+            [board.port for board in boards], image, retries=2, retry_delay=0.1,
+            manifest=self.flash_tool.FlashManifest(self.temp_path / "manifest.json"),
+            progress=self.flash_tool.ProgressPrinter(stream=progress))
+
+        assert [result.ok for result in results] == [True] * 5 + [False]
+        assert all(bytes(board.flash[:len(image)]) == image for board in healthy + [flaky])
+        assert results[4].attempts == 2 and results[5].attempts == 3
+        assert "flash error" in results[5].error
+        assert all(f"[{board.port}] 100%" in progress.getvalue() for board in healthy)
+
+        table = self.flash_tool.format_results(results)
+        assert table.splitlines()[0].split() == ["PORT", "DEVICE", "RESULT", "SECTORS", "TRIES", "TIME", "ERROR"]
+        assert table.count("PASS") == 5 and table.count("FAIL") == 1
+        assert table.endswith("5/6 devices passed")
+
+        # Every device is in the shared manifest, so a rerun sends nothing
+        results = self.flash_tool.flash_all([board.port for board in healthy], image, retries=0,
+                                            manifest=self.flash_tool.FlashManifest(self.temp_path / "manifest.json"))
+        assert [(result.ok, result.changed) for result in results] == [(True, 0)] * 4
@@ -0,0 +1,62 @@
+import shutil
+import subprocess
+import sys
+import pytest
+from tests.helpers import GeneratedProjectTest
+
+
+pytestmark = pytest.mark.skipif(not (shutil.which("cc") or shutil.which("gcc")), reason="host C compiler is required")
+
+
+class TestHostBuild(GeneratedProjectTest):
+    def setup_method(self):
+        super().setup_method()
+        self.create_project(driver_pack=True)
+        self.unit_dir = self.base_path / "tests" / "unit"
+        self.host_build = self.load_script("tests/unit/host_build.py")
+        self.cache_dir = self.temp_path / "cache"
+
+    def build_and_run(self):
+        build = self.host_build.HostBuild(cache_dir=self.cache_dir, extra_flags=["-Werror"])
+        results = build.run(build.build())
+        return build, {result.name: result for result in results}
+
+    def test_generated_host_tests_pass(self):
+        build, results = self.build_and_run()
+
+        assert sorted(results) == ["test_drivers", "test_gpio", "test_system"]
+        assert all(result.returncode == 0 for result in results.values()), results
+        assert "4/4 passed" in results["test_drivers"].output
+        # main.c and startup.c are target-only
+        sources = {path.name for path in self.host_build.firmware_sources()}
+        assert sources == {"system.c", "gpio.c", "uart.c", "spi.c"}
+        assert (build.hits, build.misses) == (0, 8)
+
+    def test_objects_are_cached_by_source_and_header_hash(self):
+        self.build_and_run()
+        build, _ = self.build_and_run()
+        assert (build.hits, build.misses) == (8, 0)
+
+        # Only the objects that include system.h are rebuilt
+        header = self.base_path / "firmware" / "include" / "system.h"
+        header.write_text(header.read_text() + "\n#define HOST_BUILD_TEST 1\n")
+        build, results = self.build_and_run()
+        assert (build.hits, build.misses) == (6, 2)
+        assert all(result.returncode == 0 for result in results.values())
+
+    def test_failures_are_reported_per_program(self):
+        (self.unit_dir / "host" / "test_broken.c").write_text(
+            '#include "unit.h"\n'
+            "TEST(fails) { CHECK_EQ(1 + 1, 3); }\n"
+            "int main(void) { RUN(fails); return unit_report(); }\n")
+        _, results = self.build_and_run()
+
+        assert results["test_broken"].returncode == 1
+        assert "1 + 1 == 2, expected 3" in results["test_broken"].output
+        assert results["test_gpio"].returncode == 0
+
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "test_host.py"],
+            cwd=str(self.unit_dir), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        assert result.returncode == 1, result.stdout
+        assert "1 failed, 3 passed" in result.stdout
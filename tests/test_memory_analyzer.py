@@ -0,0 +1,123 @@
+import shutil
+import subprocess
+import pytest
+import time
+from pathlib import Path
+from tests.helpers import GeneratedProjectTest
+
+
+needs_gcc = pytest.mark.skipif(not shutil.which("gcc"), reason="host gcc is required")
+
+APP_SOURCE = (
+    "const char lookup[LOOKUP_SIZE] = {1};\n"
+    "int seeds[16] = {1};\n"
+    "int counters[64];\n"
+    "int main(void) { counters[3] += seeds[3]; return lookup[counters[3] % LOOKUP_SIZE]; }\n")
+
+
+class TestMemoryAnalyzer(GeneratedProjectTest):
+    def setup_method(self):
+        super().setup_method()
+        self.create_project()
+        self.firmware = self.base_path / "firmware"
+        self.analyzer = self.load_script("tools/utilities/memory_analyzer.py")
+
+    def link(self, lookup_size: int) -> Path:
+        """Host-link startup.c and a small app with the generated script, writing a map file"""
+        # The host libc/libm archives are linker scripts, so drop the /DISCARD/ block
+        script = (self.firmware / "linker_scripts" / "linker_script.ld").read_text()
+        host_script = self.temp_path / "host.ld"
+        host_script.write_text(script[:script.index("    /* Remove information")] + "}\n")
+        (self.temp_path / "app.c").write_text(APP_SOURCE)
+        flags = ["gcc", "-O2", "-ffreestanding", "-fno-pic", "-fno-asynchronous-unwind-tables",
+                 "-I" + str(self.firmware / "include")]
+
+        for source in (self.firmware / "src" / "startup.c", self.temp_path / "app.c"):
+            compile_ = subprocess.run(
+                flags + ["-DLOOKUP_SIZE=%d" % lookup_size, "-c", str(source),
+                         "-o", str(self.temp_path / (source.stem + ".o"))],
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+            assert compile_.returncode == 0, compile_.stdout
+
+        elf = self.temp_path / "app.elf"
+        link = subprocess.run(
+            flags + ["-nostdlib", "-static", "-no-pie", "-T", str(host_script), "-e", "Reset_Handler",
+                     "-Wl,-Map=" + str(elf.with_suffix(".map")), "-Wl,--no-gc-sections",
+                     str(self.temp_path / "startup.o"), str(self.temp_path / "app.o"), "-o", str(elf)],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        assert link.returncode == 0, link.stdout
+        return elf
+
+    @needs_gcc
+    def test_usage_is_attributed_per_object_and_symbol(self):
+        elf = self.link(1000)
+        report = self.analyzer.analyze(str(elf), str(elf.with_suffix(".map")))
+
+        symbols = {symbol.name: symbol for symbol in report["symbols"]}
+        assert (symbols["lookup"].size, symbols["lookup"].flash, symbols["lookup"].ram) == (1000, True, False)
+        assert (symbols["seeds"].size, symbols["seeds"].flash, symbols["seeds"].ram) == (64, True, True)
+        assert (symbols["counters"].size, symbols["counters"].flash, symbols["counters"].ram) == (256, False, True)
+        assert symbols["Reset_Handler"].flash and not symbols["Reset_Handler"].ram
+        assert report["symbols"][0].name == "lookup"
+
+        objects = {Path(usage.name).name: usage for usage in report["objects"]}
+        assert objects["app.o"].flash >= 1000 + 64
+        assert 64 + 256 <= objects["app.o"].ram < 1024
+        assert objects["startup.o"].flash > 0
+        # Objects account for what the section table reports, minus linker padding
+        assert sum(usage.flash for usage in report["objects"]) <= report["flash"]
+        assert report["objects"][0].name.endswith("app.o")
+
+    @needs_gcc
+    def test_history_reports_deltas_between_builds(self):
+        history = self.analyzer.History(self.temp_path / "history.db")
+        try:
+            elf = self.link(1000)
+            first = history.record(self.analyzer.analyze(str(elf), str(elf.with_suffix(".map"))), "abc1234", str(elf))
+            elf = self.link(1500)
+            second = history.record(self.analyzer.analyze(str(elf), str(elf.with_suffix(".map"))), "def5678", str(elf))
+
+            assert history.build_id() == second
+            assert history.build_id(before=second) == first == history.build_id(ref="abc")
+            delta = history.diff(first, second)
+        finally:
+            history.close()
+
+        assert delta["flash"] >= 500 and delta["ram"] == 0
+        assert delta["symbols"][0] == ("lookup", ".rodata", 500)
+        assert [Path(usage.name).name for usage in delta["objects"]] == ["app.o"]
+
+    def test_large_map_file_parses_quickly(self):
+        analyzer = self.analyzer
+        sections = {
+            ".text": analyzer.Section(".text", 1, analyzer.SHF_ALLOC, 0x08000000, 0, 0, 0, 0),
+            ".data": analyzer.Section(".data", 1, analyzer.SHF_ALLOC, 0x20000000, 0, 0, 0, 0),
+            ".bss": analyzer.Section(".bss", analyzer.SHT_NOBITS, analyzer.SHF_ALLOC, 0x20001000, 0, 0, 0, 0),
+            ".debug_info": analyzer.Section(".debug_info", 1, 0, 0, 0, 0, 0, 0),
+        }
+        lines = ["Discarded input sections\n\n .text.unused   0x00000000      0x400 build/gone.o\n",
+                 "\nLinker script and memory map\n\n"]
+        for output, count in ((".text", 40000), (".data", 5000), (".bss", 5000), (".debug_info", 5000)):
+            lines.append(f"{output}           0x08000000   0x100000 load address 0x08080000\n")
+            for index in range(count):
+                name = f"{output}.function_with_a_long_name_{index}"
+                obj = f"build/obj/release/src/module_{index % 200}.o"
+                if index % 3:
+                    lines.append(f" {name}\n                0x08000000       0x10 {obj}\n")
+                else:
+                    lines.append(f" {name[:12]}   0x08000000       0x10 {obj}\n")
+                lines.append(f"                0x08000000                symbol_{index}\n")
+            lines.append(" *fill*         0x08000000        0x2 \n")
+        map_path = self.temp_path / "large.map"
+        map_path.write_text("".join(lines))
+        assert map_path.stat().st_size > 5 * 1024 * 1024
+
+        start = time.perf_counter()
+        objects = analyzer.analyze_map(str(map_path), sections)
+        elapsed = time.perf_counter() - start
+
+        assert len(objects) == 200
+        assert sum(usage.flash for usage in objects) == 0x10 * (40000 + 5000)
+        assert sum(usage.ram for usage in objects) == 0x10 * (5000 + 5000)
+        assert all("gone" not in usage.name for usage in objects)
+        assert elapsed < 1.0
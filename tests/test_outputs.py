@@ -0,0 +1,174 @@
+import io
+import json
+import os
+import tarfile
+import zipfile
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from embedsmith import EmbeddedProjectCreator, ProjectConfig
+from embedsmith.cli import main
+from embedsmith import embedsmith
+from embedsmith.events import SilentSink
+from embedsmith.outputs import MemoryOutput, StagedOutput, TarOutput, ZipOutput
+
+
+class TestMemoryOutput:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir) / "preview"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_project_renders_into_memory(self):
+        output = MemoryOutput()
+        creator = EmbeddedProjectCreator(str(self.base_path), ProjectConfig(mcu="cortex-m7"), output=output)
+
+        assert creator.create_project()
+
+        files = output.as_dict(self.base_path)
+        assert b"cortex-m7" in files["firmware/Makefile"]
+        assert json.loads(files["embedsmith.json"])["mcu"] == "cortex-m7"
+        assert self.base_path / "tools" / "scripts" / "flash_tool.py" in output.executables
+        assert not self.base_path.exists()
+
+    def test_parallel_memory_output_matches_sequential(self):
+        sequential, parallel = MemoryOutput(), MemoryOutput()
+
+        assert EmbeddedProjectCreator(str(self.base_path), output=sequential).create_project()
+        assert EmbeddedProjectCreator(str(self.base_path), jobs=4, output=parallel).create_project()
+        assert sequential.files == parallel.files
+
+    def test_cli_dry_run_writes_nothing(self, capsys):
+        with pytest.raises(SystemExit) as exit_info:
+            main([str(self.base_path), "--dry-run"])
+
+        assert exit_info.value.code == 0
+        assert "firmware/Makefile" in capsys.readouterr().out
+        assert not self.base_path.exists()
+
+
+class TestArchiveOutput:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+        self.base_path = self.temp_path / "board"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_tar_archive_preserves_modes_and_directories(self):
+        buffer = io.BytesIO()
+        with TarOutput(buffer, self.base_path) as output:
+            assert EmbeddedProjectCreator(str(self.base_path), jobs=4, output=output).create_project()
+
+        with tarfile.open(fileobj=io.BytesIO(buffer.getvalue()), mode="r:gz") as tar:
+            members = {member.name: member for member in tar.getmembers()}
+
+        assert members["board"].isdir()
+        assert members["board/firmware/src"].isdir()
+        assert members["board/tools/scripts/flash_tool.py"].mode == 0o755
+        assert members["board/firmware/Makefile"].mode == 0o644
+        assert not self.base_path.exists()
+
+    def test_zip_archive_matches_memory_output(self):
+        memory = MemoryOutput()
+        EmbeddedProjectCreator(str(self.base_path), output=memory).create_project()
+
+        buffer = io.BytesIO()
+        with ZipOutput(buffer, self.base_path) as output:
+            EmbeddedProjectCreator(str(self.base_path), output=output).create_project()
+
+        with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as archive:
+            files = {info.filename[len("board/"):]: archive.read(info)
+                     for info in archive.infolist() if not info.is_dir()}
+            flash_tool = archive.getinfo("board/tools/scripts/flash_tool.py")
+
+        assert files == memory.as_dict(self.base_path)
+        assert (flash_tool.external_attr >> 16) & 0o777 == 0o755
+
+    def test_entries_never_leave_the_root(self):
+        with TarOutput(io.BytesIO(), Path("..")) as output:
+            with pytest.raises(ValueError, match="leave the project root"):
+                output.arcname(Path("../firmware"))
+        with TarOutput(io.BytesIO(), self.base_path) as output:
+            assert output.arcname(self.base_path / "firmware" / "src") == "board/firmware/src"
+            with pytest.raises(ValueError, match="leave the project root"):
+                output.arcname(self.base_path / ".." / "escape")
+
+    def test_cli_archive(self):
+        target = self.temp_path / "board.zip"
+
+        with pytest.raises(SystemExit) as exit_info:
+            main([str(self.base_path), "--archive", str(target)])
+
+        assert exit_info.value.code == 0
+        assert zipfile.is_zipfile(target)
+        assert not self.base_path.exists()
+
+
+class TestStagedOutput:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+        self.base_path = self.temp_path / "project"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_atomic_create_and_regenerate(self):
+        assert embedsmith(str(self.base_path), events=SilentSink(), atomic=True)
+        (self.base_path / "notes.txt").write_text("user file\n")
+        license_inode = (self.base_path / "LICENSE").stat().st_ino
+
+        assert embedsmith(str(self.base_path), ProjectConfig(mcu="cortex-m7"), overwrite=True,
+                          events=SilentSink(), atomic=True)
+
+        assert "cortex-m7" in (self.base_path / "firmware" / "Makefile").read_text()
+        assert (self.base_path / "notes.txt").read_text() == "user file\n"
+        # Unchanged files are carried over by link, not rewritten
+        assert (self.base_path / "LICENSE").stat().st_ino == license_inode
+        assert sorted(p.name for p in self.temp_path.iterdir()) == ["project"]
+
+    def test_atomic_generation_into_the_current_directory(self, monkeypatch):
+        self.base_path.mkdir()
+        monkeypatch.chdir(self.base_path)
+        for _ in range(2):
+            with pytest.raises(SystemExit) as exit_info:
+                main([".", "--atomic", "--overwrite", "--quiet"])
+            assert exit_info.value.code == 0
+            # The process follows the swapped-in tree
+            assert Path(os.getcwd()) == self.base_path.resolve()
+            (self.base_path / "notes.txt").write_text("user file\n")
+
+        assert (self.base_path / "firmware" / "Makefile").exists()
+        assert (self.base_path / "notes.txt").read_text() == "user file\n"
+        assert not any(".staging-" in path.name for path in self.base_path.rglob("*"))
+        assert sorted(p.name for p in self.temp_path.iterdir()) == ["project"]
+
+    def test_failed_run_leaves_live_tree_untouched(self):
+        assert embedsmith(str(self.base_path), events=SilentSink())
+        makefile = (self.base_path / "firmware" / "Makefile").read_text()
+
+        with StagedOutput(self.base_path) as output:
+            creator = EmbeddedProjectCreator(str(self.base_path), ProjectConfig(mcu="cortex-m7"),
+                                             output=output, events=SilentSink())
+            assert creator.create_project(overwrite=True)
+            assert "cortex-m7" in (output.staging / "firmware" / "Makefile").read_text()
+            # No commit(): simulates a crash before the swap
+
+        assert (self.base_path / "firmware" / "Makefile").read_text() == makefile
+        assert sorted(p.name for p in self.temp_path.iterdir()) == ["project"]
+
+    def test_staged_write_does_not_touch_live_files(self):
+        assert embedsmith(str(self.base_path), events=SilentSink())
+        live = self.base_path / "firmware" / "Makefile"
+
+        with StagedOutput(self.base_path) as output:
+            output.write_text(live, "staged\n")
+            assert live.read_text() != "staged\n"
+            output.commit()
+
+        assert live.read_text() == "staged\n"
@@ -0,0 +1,146 @@
+import pytest
+import subprocess
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+from embedsmith import EmbeddedProjectCreator, ProjectConfig
+from embedsmith.cli import main
+from embedsmith.config.default_config import DEFAULT_CONFIG
+from embedsmith.events import SilentSink
+from embedsmith.presets import PRESETS, get_preset, preset_names, template_values, _build_index, _preset
+
+
+class TestPresetRegistry:
+    def test_lookup_by_name_and_alias(self):
+        assert get_preset("cortex-m7").fpu == "fpv5-d16"
+        assert get_preset("Cortex-M0+") is get_preset("cortex-m0plus")
+        assert get_preset("my-custom-soc") is None
+        assert DEFAULT_CONFIG["supported_mcus"] == preset_names()
+
+    def test_registry_is_validated(self):
+        overlapping = _preset("bad", "", "arm", "-mcpu=cortex-m7 -mthumb", "gcc",
+                              flash=("0x08000000", "1M"), ram=("0x20000000", "128K"),
+                              tcm=[("DTCM", "0x20010000", "64K")])
+        with pytest.raises(ValueError, match="overlaps"):
+            _build_index([overlapping])
+        hard_float = _preset("bad", "", "arm", "-mcpu=cortex-m3", "gcc",
+                             flash=("0x08000000", "1M"), ram=("0x20000000", "128K"), float_abi="hard")
+        with pytest.raises(ValueError, match="FPU"):
+            _build_index([hard_float])
+        unknown_tcm = _preset("bad", "", "arm", "-mcpu=cortex-m7", "gcc",
+                              flash=("0x08000000", "1M"), ram=("0x20000000", "128K"),
+                              tcm=[("OCM", "0x10000000", "64K")])
+        with pytest.raises(ValueError, match="tightly-coupled"):
+            _build_index([unknown_tcm])
+        with pytest.raises(ValueError, match="Duplicate"):
+            _build_index([PRESETS[0], PRESETS[0]])
+
+    def test_fpu_flags(self):
+        assert template_values("cortex-m4")["cpu_flags"] == \
+            "-mcpu=cortex-m4 -mthumb -mfpu=fpv4-sp-d16 -mfloat-abi=hard"
+        assert template_values("cortex-m0")["cpu_flags"] == "-mcpu=cortex-m0 -mthumb -mfloat-abi=soft"
+        assert "-mfloat-abi" not in template_values("riscv-rv32")["cpu_flags"]
+
+    def test_config_resolves_against_preset(self):
+        config = ProjectConfig.from_preset("cortex-m0+", flash_size="32K", ram_size=None)
+
+        assert config.mcu == "cortex-m0plus"
+        assert (config.flash_size, config.ram_size, config.ram_start) == ("32K", "16K", "0x20000000")
+        assert ProjectConfig.from_preset() == ProjectConfig()
+        assert ProjectConfig.from_preset("my-custom-soc").flash_size == ProjectConfig().flash_size
+
+    def test_plain_config_uses_the_preset_memory_map(self):
+        config = ProjectConfig(mcu="cortex-m7", ram_code=True)
+        assert (config.ram_start, config.ram_size) == ("0x20020000", "384K")
+        assert config == ProjectConfig.from_preset("cortex-m7", ram_code=True)
+        assert ProjectConfig(mcu="cortex-m4F").mcu == "cortex-m4"
+
+        # Explicit regions are checked against the preset's TCM
+        with pytest.raises(ValueError, match="DTCM overlaps RAM"):
+            ProjectConfig(mcu="cortex-m7", ram_start="0x20000000", ram_size="128K")
+        with pytest.raises(ValueError, match="ITCM overlaps FLASH"):
+            ProjectConfig(mcu="cortex-m7", flash_start="0x00000000")
+        with pytest.raises(ValueError, match="RAM overlaps FLASH"):
+            ProjectConfig(mcu="my-custom-soc", flash_start="0x20000000")
+
+    def test_config_file_uses_the_preset_memory_map(self, tmp_path):
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"mcu": "cortex-m7", "ram_code": true}')
+
+        with pytest.raises(SystemExit) as exit_info:
+            main([str(tmp_path / "project"), "--config", str(config_file), "--quiet"])
+
+        assert exit_info.value.code == 0
+        linker_script = (tmp_path / "project" / "firmware" / "linker_scripts" / "linker_script.ld").read_text()
+        assert "RAM (rwx)   : ORIGIN = 0x20020000, LENGTH = 384K" in linker_script
+
+        config_file.write_text('{"mcu": "cortex-m7", "ram_start": "0x20000000"}')
+        with pytest.raises(SystemExit) as exit_info:
+            main([str(tmp_path / "other"), "--config", str(config_file), "--quiet"])
+        assert exit_info.value.code == 1
+
+    def test_list_presets(self, capsys):
+        main(["--list-presets"])
+
+        output = capsys.readouterr().out
+        assert all(name in output for name in preset_names())
+        assert "DTCM 128K" in output
+
+
+class TestPresetTemplates:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir) / "project"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_templates_consume_preset(self):
+        creator = EmbeddedProjectCreator(str(self.base_path), ProjectConfig.from_preset("cortex-m7"),
+                                         events=SilentSink())
+        assert creator.create_project()
+        firmware = self.base_path / "firmware"
+
+        makefile = (firmware / "Makefile").read_text()
+        assert "CPUFLAGS = -mcpu=cortex-m7 -mthumb -mfpu=fpv5-d16 -mfloat-abi=hard" in makefile
+        linker_script = (firmware / "linker_scripts" / "linker_script.ld").read_text()
+        assert "RAM (rwx)   : ORIGIN = 0x20020000, LENGTH = 384K" in linker_script
+        assert "DTCM (rwx)  : ORIGIN = 0x20000000, LENGTH = 128K" in linker_script
+        config_h = (firmware / "include" / "config.h").read_text()
+        assert "#ifndef MCU_CORTEX_M7\n#define MCU_CORTEX_M7 1\n#endif" in config_h
+        assert "#define FLASH_SIZE 1048576U" in config_h
+        assert "#define DTCM_SIZE 131072U" in config_h
+        assert "${" not in config_h
+
+    def test_generated_hardware_tests_pass_for_every_preset(self):
+        for name in preset_names():
+            base_path = Path(self.temp_dir) / name
+            config = ProjectConfig(mcu=name)
+            assert EmbeddedProjectCreator(str(base_path), config, events=SilentSink()).create_project()
+
+            result = subprocess.run([sys.executable, "-m", "unittest", "test_main.TestHardware"],
+                                    cwd=str(base_path / "tests" / "unit"), stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT, universal_newlines=True)
+            assert result.returncode == 0, f"{name}: {result.stdout}"
+            assert "Ran 2 tests" in result.stdout
+
+    def test_ram_code_sections(self):
+        config = ProjectConfig.from_preset("cortex-m7", ram_code=True)
+        assert EmbeddedProjectCreator(str(self.base_path), config, events=SilentSink()).create_project()
+        firmware = self.base_path / "firmware"
+
+        linker_script = (firmware / "linker_scripts" / "linker_script.ld").read_text()
+        assert "*(.ramfunc)" in linker_script
+        assert "} >ITCM AT> FLASH\n    _siitcm = LOADADDR(.itcm_text);" in linker_script
+        assert ".dtcm_bss (NOLOAD) :" in linker_script
+        config_h = (firmware / "include" / "config.h").read_text()
+        assert "#define RAM_CODE_ENABLED 1" in config_h
+        startup = (firmware / "src" / "startup.c").read_text()
+        assert "copy_words(&_sitcm, &_siitcm, &_eitcm);" in startup
+
+    def test_ram_code_is_opt_in(self):
+        values = template_values("cortex-m7")
+        assert values["ram_code_enabled"] == 0 and values["tcm_sections"] == ""
+        # No TCM on the M4: RAMFUNC still works, TCM macros fall back to RAM
+        assert template_values("cortex-m4", ram_code=True)["tcm_sections"] == ""
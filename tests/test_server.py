@@ -0,0 +1,157 @@
+import io
+import json
+import socket
+import tarfile
+import threading
+import zipfile
+import http.client
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from embedsmith.server import RenderService, RequestError, make_server
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path):
+        super().__init__("localhost")
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+class TestRenderService:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_dir = Path(self.temp_dir)
+        self.service = RenderService(str(self.template_dir), max_concurrent=2)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_identical_configs_hit_the_cache(self):
+        first, key, hit = self.service.render({"mcu": "cortex-m7"})
+        # Spelling out a default does not change the canonical key
+        second, second_key, second_hit = self.service.render({"mcu": "cortex-m7", "compiler": "arm-none-eabi-gcc"})
+
+        assert (hit, second_hit) == (False, True)
+        assert key == second_key and first == second
+        with tarfile.open(fileobj=io.BytesIO(first)) as tar:
+            assert b"cortex-m7" in tar.extractfile("firmware/firmware/Makefile").read()
+        stats = self.service.stats_dict()
+        assert (stats["requests"], stats["hits"], stats["misses"]) == (2, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_template_change_invalidates_cached_archives(self):
+        _, key, _ = self.service.render({})
+        (self.template_dir / "license.j2").write_text("Custom ${license}")
+
+        archive, new_key, hit = self.service.render({}, "zip")
+        _, zip_key, _ = self.service.render({}, "zip")
+
+        assert not hit and new_key != key and zip_key == new_key
+        with zipfile.ZipFile(io.BytesIO(archive)) as archive_zip:
+            assert archive_zip.read("firmware/LICENSE") == b"Custom MIT"
+
+    def test_bad_requests_are_rejected(self):
+        with pytest.raises(RequestError, match="cpu") as error:
+            self.service.render({"cpu": "m4"})
+        assert error.value.status == 400
+        with pytest.raises(RequestError):
+            self.service.render({}, "rar")
+
+    def test_project_names_that_escape_the_archive_are_rejected(self):
+        for name in ("..", ".", "a/../..", "../evil", "a\\b", ""):
+            with pytest.raises(RequestError, match="project name") as error:
+                self.service.render({"project_name": name})
+            assert error.value.status == 400
+        assert self.service.stats_dict()["misses"] == 0
+
+    def test_concurrency_limit(self):
+        self.service = RenderService(max_concurrent=1, queue_timeout=0.01)
+        self.service._slots.acquire()
+        try:
+            with pytest.raises(RequestError) as error:
+                self.service.render({"project_name": "busy"})
+        finally:
+            self.service._slots.release()
+
+        assert error.value.status == 503
+        assert self.service.stats_dict()["rejected"] == 1
+
+
+class TestRenderServer:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.service = RenderService()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run(self, server, connect):
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            connection = connect()
+            connection.request("POST", "/render?format=zip", json.dumps({"project_name": "demo"}),
+                               {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            body = response.read()
+            assert response.status == 200
+            assert response.getheader("X-Embedsmith-Cache") == "miss"
+            with zipfile.ZipFile(io.BytesIO(body)) as archive:
+                assert "demo/firmware/Makefile" in archive.namelist()
+
+            connection.request("GET", "/stats")
+            response = connection.getresponse()
+            assert json.loads(response.read())["misses"] == 1
+
+            connection.request("POST", "/render", b"not json")
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 400
+
+            connection.request("POST", "/render", json.dumps({"project_name": ".."}),
+                               {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            assert response.status == 400
+            assert b"project name" in response.read()
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_invalid_content_length_is_rejected(self):
+        server = make_server(self.service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            for length, status in (("-1", b"400"), ("12Q", b"400"), (str(1 << 30), b"413")):
+                with socket.create_connection(server.server_address[:2], timeout=10) as client:
+                    client.sendall(f"POST /render HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n{{}}"
+                                   .encode("ascii"))
+                    response = b""
+                    while True:
+                        chunk = client.recv(4096)
+                        if not chunk:
+                            break
+                        response += chunk
+                assert response.split()[1] == status, response
+                assert b"Connection: close" in response
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_tcp(self):
+        server = make_server(self.service, port=0)
+        host, port = server.server_address[:2]
+        self.run(server, lambda: http.client.HTTPConnection(host, port))
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+    def test_unix_socket(self):
+        socket_path = str(Path(self.temp_dir) / "embedsmith.sock")
+        server = make_server(self.service, socket_path=socket_path)
+        self.run(server, lambda: UnixHTTPConnection(socket_path))
+        assert not Path(socket_path).exists()
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import embedsmith
+from embedsmith import cli, core, events, outputs, store
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported just to parse arguments or list presets
+HEAVY_MODULES = [
+    "embedsmith.core", "embedsmith.templates", "embedsmith.outputs", "embedsmith.events",
+    "embedsmith.batch", "json", "dataclasses", "tarfile", "zipfile", "concurrent.futures",
+]
+
+# Generous ceiling for `import embedsmith.cli`, in microseconds
+IMPORT_BUDGET_US = 100000
+
+
+def run_python(code, *args):
+    return subprocess.run([sys.executable] + list(args) + ["-c", code],
+                          cwd=str(ROOT), capture_output=True, text=True, check=True)
+
+
+class TestStartup:
+    def test_list_presets_does_not_load_core(self):
+        result = run_python(
+            "import sys\n"
+            "from embedsmith.cli import main\n"
+            "main(['--list-presets'])\n"
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+        )
+        assert result.stdout.splitlines()[-1] == "[]"
+
+    def test_import_time_budget(self):
+        result = run_python("import embedsmith.cli", "-X", "importtime")
+        cumulative = [int(line.split("|")[1]) for line in result.stderr.splitlines()
+                      if line.rstrip().endswith(" embedsmith.cli")]
+        assert cumulative and cumulative[0] < IMPORT_BUDGET_US
+
+    def test_lazy_exports_resolve(self):
+        for name in embedsmith.__all__:
+            assert getattr(embedsmith, name) is not None
+
+    def test_cli_choices_match_implementations(self):
+        assert sorted(cli.PROGRESS_FORMATS) == sorted(events.SINKS)
+        assert cli.ARCHIVE_FORMATS == outputs.ARCHIVE_FORMATS
+        assert cli.BUILD_PROFILES == core.BUILD_PROFILES
+        assert sorted(cli.STORE_LINK_MODES) == sorted(store.LINK_MODES)
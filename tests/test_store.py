@@ -0,0 +1,89 @@
+import os
+import stat
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from embedsmith.core import EmbeddedProjectCreator, ProjectConfig, embedsmith
+from embedsmith.events import SilentSink
+from embedsmith.outputs import FilesystemOutput
+from embedsmith.store import ContentStore
+
+
+class TestContentStore:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+        self.store_dir = self.temp_path / "store"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def craft(self, name, store, **config):
+        creator = EmbeddedProjectCreator(str(self.temp_path / name), ProjectConfig(**config),
+                                         output=FilesystemOutput(store), events=SilentSink())
+        assert creator.create_project(overwrite=True)
+        return self.temp_path / name
+
+    def test_identical_files_share_objects(self):
+        first = self.craft("a", ContentStore(self.store_dir, link="hardlink"))
+        store = ContentStore(self.store_dir, link="hardlink")
+        second = self.craft("b", store, mcu="cortex-m7")
+
+        assert os.path.samefile(first / "LICENSE", second / "LICENSE")
+        assert not os.path.samefile(first / "firmware" / "Makefile", second / "firmware" / "Makefile")
+        assert "cortex-m7" in (second / "firmware" / "Makefile").read_text()
+        assert store.stats.hardlinked == store.stats.files
+        assert store.stats.bytes_saved >= (second / "LICENSE").stat().st_size
+
+    def test_executable_bit_is_kept(self):
+        project = self.craft("a", ContentStore(self.store_dir, link="hardlink"))
+
+        assert os.access(project / "tools" / "scripts" / "flash_tool.py", os.X_OK)
+        assert not os.access(project / "LICENSE", os.X_OK)
+
+    def test_default_never_hardlinks(self):
+        first = self.craft("a", ContentStore(self.store_dir))
+        store = ContentStore(self.store_dir)
+        second = self.craft("b", store)
+
+        # Reflinked or copied files stay independent of each other and the store
+        assert not os.path.samefile(first / "LICENSE", second / "LICENSE")
+        with open(first / "LICENSE", "a") as f:
+            f.write("edited in place\n")
+        assert "edited in place" not in (second / "LICENSE").read_text()
+        assert store.stats.hardlinked == 0
+        assert store.stats.reflinked + store.stats.copied == store.stats.files
+
+    def test_hardlinks_are_opt_in(self):
+        for name, link in (("a", "auto"), ("b", "hardlink")):
+            assert embedsmith(str(self.temp_path / name), store=str(self.store_dir), store_link=link,
+                              events=SilentSink())
+
+        assert (self.temp_path / "a" / "LICENSE").stat().st_nlink == 1
+        assert os.path.samefile(self.temp_path / "b" / "LICENSE",
+                                ContentStore(self.store_dir).add((self.temp_path / "b" / "LICENSE").read_bytes()))
+
+    def test_copy_fallback(self):
+        store = ContentStore(self.store_dir, link="copy")
+        project = self.craft("a", store)
+
+        assert (project / "LICENSE").stat().st_nlink == 1
+        assert store.stats.copied == store.stats.files
+        assert store.stats.bytes_saved == 0
+
+    def test_plain_write_does_not_touch_shared_object(self):
+        store = ContentStore(self.store_dir, link="hardlink")
+        target = self.temp_path / "a.txt"
+        store.materialize(target, b"shared")
+        obj = store.add(b"shared")
+
+        FilesystemOutput().write_text(target, "edited")
+
+        assert target.read_text() == "edited"
+        assert obj.read_bytes() == b"shared"
+        assert not stat.S_IMODE(obj.stat().st_mode) & stat.S_IWUSR
+
+    def test_unknown_link_mode(self):
+        with pytest.raises(ValueError):
+            ContentStore(self.store_dir, link="symlink")
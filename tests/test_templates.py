@@ -0,0 +1,173 @@
+import gc
+import os
+import zlib
+import pytest
+import tempfile
+import shutil
+import weakref
+from pathlib import Path
+import embedsmith.templates as templates_module
+from importlib import resources
+from embedsmith.templates import TemplateManager, TemplateCache, TemplateBundle, RenderMemo, PACKAGE_DIR
+from embedsmith.templates.pack import pack_templates
+
+
+class TestTemplateCache:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_dir = Path(self.temp_dir)
+        (self.template_dir / "hello.j2").write_text("Hello ${name}")
+        self.cache = TemplateCache(maxsize=2)
+        self.manager = TemplateManager(self.template_dir, cache=self.cache)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_repeated_render_hits_cache(self):
+        assert self.manager.render("hello.j2", {"name": "a"}) == "Hello a"
+        assert self.manager.render("hello.j2", {"name": "b"}) == "Hello b"
+
+        info = self.manager.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+        assert info.currsize == 1
+
+    def test_modified_template_is_reloaded(self):
+        template_path = self.template_dir / "hello.j2"
+        self.manager.render("hello.j2", {"name": "a"})
+
+        template_path.write_text("Goodbye ${name}")
+        stat = template_path.stat()
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert self.manager.render("hello.j2", {"name": "a"}) == "Goodbye a"
+        assert self.manager.cache_info().misses == 2
+
+    def test_eviction_is_bounded(self):
+        for name in ("one.j2", "two.j2", "three.j2"):
+            (self.template_dir / name).write_text(name)
+            self.manager.render(name, {})
+
+        info = self.manager.cache_info()
+        assert info.currsize == 2
+        assert info.evictions == 1
+
+    def test_missing_template(self):
+        with pytest.raises(FileNotFoundError):
+            self.manager.render("missing.j2", {})
+
+
+class TestTemplateBundle:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+        self.bundle_path = self.temp_path / "templates.bundle"
+        pack_templates(PACKAGE_DIR, self.bundle_path)
+        self.bundle = TemplateBundle.from_bytes(self.bundle_path.read_bytes())
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_bundle_holds_every_template(self):
+        assert sorted(self.bundle.names()) == sorted(f.name for f in PACKAGE_DIR.glob("*.j2"))
+
+    def test_bundle_renders_like_loose_files(self):
+        cache = TemplateCache()
+        bundled = TemplateManager(cache=cache, bundle=self.bundle)
+        loose = TemplateManager(cache=cache, bundle=TemplateBundle({}))
+        context = {"project_name": "demo", "mcu": "cortex-m7"}
+
+        for name in self.bundle.names():
+            assert bundled.render(name, context) == loose.render(name, context)
+        # Every bundled render was served without touching the cache
+        assert cache.info().misses == len(self.bundle.names())
+
+    def test_override_dir_takes_precedence(self):
+        override_dir = self.temp_path / "overrides"
+        override_dir.mkdir()
+        (override_dir / "license.j2").write_text("Custom ${license}")
+
+        manager = TemplateManager(override_dir, cache=TemplateCache(), bundle=self.bundle)
+
+        assert manager.render("license.j2", {"license": "MIT"}) == "Custom MIT"
+        assert "Makefile" in manager.render("makefile.j2", {})
+
+    def test_bad_version_is_rejected(self):
+        with pytest.raises(ValueError):
+            TemplateBundle.from_bytes(zlib.compress(b'{"version": 99, "templates": {}}'))
+
+    def test_corrupt_bundle_falls_back_to_loose_templates(self, monkeypatch):
+        data = self.bundle_path.read_bytes()
+        for corrupt in (data[:len(data) // 2], b"not a bundle", zlib.compress(b"[]"), zlib.compress(b"\xff")):
+            self.bundle_path.write_bytes(corrupt)
+            monkeypatch.setattr(resources, "files", lambda package: self.temp_path)
+            monkeypatch.setattr(templates_module, "_bundle", None)
+            monkeypatch.setattr(templates_module, "_bundle_loaded", False)
+
+            assert TemplateBundle.load() is None
+            manager = TemplateManager(cache=TemplateCache())
+            assert manager.bundle is None
+            assert "Makefile" in manager.render("makefile.j2", {})
+
+
+class TestRenderMemo:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_dir = Path(self.temp_dir)
+        (self.template_dir / "hello.j2").write_text("Hello ${name} from $place, $$5 ${shell_var}")
+        self.memo = RenderMemo(maxsize=2)
+        self.manager = TemplateManager(self.template_dir, cache=TemplateCache(), render_memo=self.memo)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_fields_index(self):
+        assert self.manager.template_fields("hello.j2") == {"name", "place", "shell_var"}
+        assert self.manager.dependency_index()["hello.j2"] == {"name", "place", "shell_var"}
+
+    def test_unused_fields_share_a_render(self):
+        first = self.manager.render("hello.j2", {"name": "a", "place": "b", "mcu": "cortex-m0"})
+        second = self.manager.render("hello.j2", {"name": "a", "place": "b", "mcu": "cortex-m7"})
+
+        assert first == second == "Hello a from b, $5 ${shell_var}"
+        info = self.manager.render_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_used_and_missing_fields_are_part_of_the_key(self):
+        assert self.manager.render("hello.j2", {"name": "a"}) == "Hello a from $place, $5 ${shell_var}"
+        assert self.manager.render("hello.j2", {"name": "b"}) == "Hello b from $place, $5 ${shell_var}"
+        assert self.manager.render("hello.j2", {"name": "a", "place": "x"}) == "Hello a from x, $5 ${shell_var}"
+        assert self.manager.render_info().hits == 0
+
+    def test_modified_template_is_not_served_stale(self):
+        template_path = self.template_dir / "hello.j2"
+        self.manager.render("hello.j2", {"name": "a"})
+
+        template_path.write_text("Bye ${name}")
+        stat = template_path.stat()
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert self.manager.render("hello.j2", {"name": "a"}) == "Bye a"
+
+    def test_edited_templates_are_not_pinned(self):
+        template_path = self.template_dir / "hello.j2"
+        parsed = []
+        for edit in range(20):
+            template_path.write_text(f"Edit {edit}: ${{name}}")
+            os.utime(template_path, ns=(10**9 * (edit + 1), 10**9 * (edit + 1)))
+            assert self.manager.render("hello.j2", {"name": "a"}) == f"Edit {edit}: a"
+            parsed.append(weakref.ref(self.manager.get_template("hello.j2")))
+        gc.collect()
+
+        assert len(self.memo._fields) <= self.memo.maxsize
+        assert self.manager.render_info().currsize <= self.memo.maxsize
+        # Only the current parse is still alive (held by the TemplateCache)
+        assert sum(ref() is not None for ref in parsed) == 1
+
+    def test_eviction_is_bounded(self):
+        for name in "abc":
+            self.manager.render("hello.j2", {"name": name})
+
+        info = self.manager.render_info()
+        assert info.currsize == 2
+        assert info.evictions == 1